@@ -0,0 +1,206 @@
+"""Process a directory or manifest of videos without the Streamlit UI.
+
+Usage:
+    python batch_process.py videos/ --target-lang de fr --workers 4 --concurrency 8
+    python batch_process.py manifest.txt --results-dir outputs/batch/results
+
+A manifest is a text file listing one video path per line; blank lines and
+lines starting with '#' are ignored. Each video gets a JSON summary in the
+results directory. Videos that already have a successful summary are skipped,
+so an interrupted run resumes where it stopped.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from extract_audio import AUDIO_MODES
+from extract_frames import SAMPLING_STRATEGIES
+from main import VideoProcessor
+from openai_client import close_async_client, metrics
+from result_cache import DESCRIPTION_CACHE_DIR, TRANSCRIPT_CACHE_DIR, ResultCache, TextCache
+from translation_memory import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv")
+BATCH_OUTPUT_DIR = "outputs/batch"
+
+
+def find_videos(source: str) -> List[str]:
+    """List the videos to process.
+
+    Args:
+        source: Directory to scan for videos, or a manifest file
+
+    Returns:
+        list: Video paths in a stable order
+    """
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(root, name)
+            for root, _, files in os.walk(source)
+            for name in files
+            if name.lower().endswith(VIDEO_EXTENSIONS)
+        )
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    return [os.path.join(base_dir, line) for line in lines if line and not line.startswith("#")]
+
+
+def job_id(video_path: str) -> str:
+    """Return a stable, filesystem-safe id for a video path."""
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    digest = hashlib.sha1(os.path.abspath(video_path).encode("utf-8")).hexdigest()[:10]
+    return f"{stem}-{digest}"
+
+
+def _write_json(path: str, data: Dict) -> None:
+    """Write JSON atomically so an interrupted run never leaves a partial file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _is_done(result_path: str) -> bool:
+    """Check whether a previous run already processed the video successfully."""
+    try:
+        with open(result_path, encoding="utf-8") as f:
+            return json.load(f).get("status") == "ok"
+    except (OSError, ValueError):
+        return False
+
+
+async def process_one(video_path: str, args: argparse.Namespace, executor: ProcessPoolExecutor,
+                      cache: ResultCache, text_caches: Dict,
+                      semaphore: asyncio.Semaphore) -> Dict:
+    """Process a single video and write its JSON summary.
+
+    Args:
+        video_path: Video to process
+        args: Parsed command line arguments
+        executor: Process pool running the frame and audio extraction
+        cache: Result cache shared by all videos
+        text_caches: Transcript and description caches and translation
+            memory shared by all videos, as VideoProcessor keyword arguments
+        semaphore: Bounds the number of videos in flight
+
+    Returns:
+        dict: The summary written to the results directory
+    """
+    name = job_id(video_path)
+    result_path = os.path.join(args.results_dir, f"{name}.json")
+
+    async with semaphore:
+        start = time.perf_counter()
+        result = {"video": video_path, "target_langs": args.target_langs}
+        try:
+            processor = VideoProcessor(
+                video_path,
+                frame_interval=args.frame_interval,
+                frame_strategy=args.frame_strategy,
+                frame_workers=args.frame_workers,
+                audio_mode=args.audio_mode,
+                cache=cache,
+                output_dir=os.path.join(args.output_dir, name),
+                executor=executor,
+                translate_transcript=not args.no_transcript_translation,
+                **text_caches,
+            )
+            results = await processor.process_languages_async(args.target_langs)
+            result.update(
+                status="ok",
+                results={lang: {"transcript": transcript, "description": description}
+                         for lang, (transcript, description) in results.items()},
+                plan=processor.plan.as_dict() if processor.plan else None,
+                frames=[{"path": path, "timestamp": timestamp}
+                        for path, timestamp in processor.extracted_frames],
+                audio_path=processor.audio_path,
+            )
+        except Exception as e:
+            logger.error(f"Failed to process {video_path}: {str(e)}")
+            result.update(status="error", error=str(e))
+        result["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+
+    _write_json(result_path, result)
+    logger.info(f"{result['status']}: {video_path} ({result['elapsed_seconds']}s)")
+    return result
+
+
+async def run_batch(args: argparse.Namespace) -> List[Dict]:
+    """Process all pending videos with a process pool for extraction and
+    concurrent async API calls.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        list: Summaries of the videos processed in this run
+    """
+    os.makedirs(args.results_dir, exist_ok=True)
+    videos = find_videos(args.source)
+    pending = [video for video in videos
+               if not _is_done(os.path.join(args.results_dir, f"{job_id(video)}.json"))]
+    logger.info(f"{len(videos)} videos found, {len(videos) - len(pending)} already done")
+
+    cache = ResultCache()
+    text_caches = {"transcript_cache": TextCache(TRANSCRIPT_CACHE_DIR),
+                   "description_cache": TextCache(DESCRIPTION_CACHE_DIR),
+                   "translation_memory": TranslationMemory()}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            return await asyncio.gather(*(
+                process_one(video, args, executor, cache, text_caches, semaphore)
+                for video in pending
+            ))
+    finally:
+        # The batch loop ends with this call; release its connection pool
+        await close_async_client()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="Directory of videos or manifest file")
+    parser.add_argument("--target-lang", dest="target_langs", nargs="+", default=["en"],
+                        help="Target language codes, all produced from one pass per video")
+    parser.add_argument("--no-transcript-translation", action="store_true",
+                        help="Keep transcripts in their spoken language, only translate "
+                             "the descriptions")
+    parser.add_argument("--frame-interval", type=int, default=60)
+    parser.add_argument("--frame-strategy", default="sharpest", choices=SAMPLING_STRATEGIES)
+    parser.add_argument("--frame-workers", type=int, default=1,
+                        help="Processes decoding segments of each video in parallel")
+    parser.add_argument("--audio-mode", default="copy", choices=AUDIO_MODES)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Processes used for frame and audio extraction")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Videos processed concurrently (bounds parallel API calls)")
+    parser.add_argument("--output-dir", default=BATCH_OUTPUT_DIR,
+                        help="Root directory of the per-video outputs")
+    parser.add_argument("--results-dir", default=os.path.join(BATCH_OUTPUT_DIR, "results"),
+                        help="Directory of the per-video JSON summaries")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = asyncio.run(run_batch(args))
+    failed = sum(result["status"] != "ok" for result in results)
+    logger.info(f"Processed {len(results)} videos, {failed} failed. "
+                f"OpenAI connection reuse: {metrics}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
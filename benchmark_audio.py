@@ -0,0 +1,44 @@
+"""Benchmark audio extraction modes of extract_audio.
+
+Usage:
+    python benchmark_audio.py path/to/video.mp4 --modes mp3 speech
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from extract_audio import AUDIO_MODES, extract_audio
+
+
+def benchmark(video_path, mode):
+    """Extract the audio into a scratch directory and return (seconds, bytes)."""
+    output_dir = tempfile.mkdtemp(prefix="bench_audio_")
+    try:
+        output_path = os.path.join(output_dir, "audio" + AUDIO_MODES[mode])
+        start = time.perf_counter()
+        written = extract_audio(video_path, output_path, mode=mode)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(written) if written else 0
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video_path")
+    parser.add_argument("--modes", nargs="+", default=list(AUDIO_MODES), choices=AUDIO_MODES)
+    args = parser.parse_args()
+
+    results = [(mode, *benchmark(args.video_path, mode)) for mode in args.modes]
+
+    print(f"\n{'mode':>8} {'seconds':>8} {'size KB':>9} {'speedup':>8}")
+    baseline = results[0][1]
+    for mode, elapsed, size in results:
+        print(f"{mode:>8} {elapsed:>8.2f} {size / 1024:>9.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
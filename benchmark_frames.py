@@ -0,0 +1,110 @@
+"""Benchmark frame sampling strategies and output encodings of extract_frames.
+
+Usage:
+    python benchmark_frames.py path/to/video.mp4 --intervals 30 60 300
+    python benchmark_frames.py path/to/video.mp4 --encode --max-dimensions 0 1920 1280
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import cv2
+
+from extract_frames import (DEFAULT_QUALITY, IMAGE_FORMATS, SAMPLING_STRATEGIES,
+                            encode_frame, extract_frames, resize_frame)
+
+
+def benchmark(video_path, frame_interval, strategy):
+    """Run one extraction into a scratch directory and return timing stats."""
+    output_dir = tempfile.mkdtemp(prefix="bench_frames_")
+    try:
+        start = time.perf_counter()
+        frames = extract_frames(video_path, output_dir, frame_interval, strategy=strategy)
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return len(frames), elapsed
+
+
+def sample_frames(video_path, count):
+    """Decode `count` frames spread evenly over the video."""
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    frames = []
+    for i in range(count):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, i * total_frames // count)
+        success, frame = cap.read()
+        if success:
+            frames.append(frame)
+    cap.release()
+    return frames
+
+
+def benchmark_encode(frames, image_format, max_dimension, quality):
+    """Return (seconds per frame, bytes per frame) for resizing and encoding."""
+    start = time.perf_counter()
+    total_bytes = 0
+    for frame in frames:
+        if max_dimension:
+            frame = resize_frame(frame, max_dimension)
+        total_bytes += encode_frame(frame, image_format, quality).nbytes
+    elapsed = time.perf_counter() - start
+    return elapsed / len(frames), total_bytes / len(frames)
+
+
+def run_encode(args):
+    """Print encode time and size per frame for each format/size/quality setting."""
+    frames = sample_frames(args.video_path, args.sample_frames)
+    height, width = frames[0].shape[:2]
+    print(f"{len(frames)} source frames of {width}x{height}\n")
+    print(f"{'format':>6} {'max dim':>7} {'quality':>7} {'ms/frame':>9} {'KB/frame':>9}")
+    for image_format in args.formats:
+        # PNG is lossless, the quality setting does not apply
+        qualities = [None] if IMAGE_FORMATS[image_format] is None else args.qualities
+        for max_dimension in args.max_dimensions:
+            for quality in qualities:
+                seconds, size = benchmark_encode(frames, image_format, max_dimension,
+                                                 quality or DEFAULT_QUALITY)
+                print(f"{image_format:>6} {max_dimension or 'full':>7} {quality or '-':>7} "
+                      f"{seconds * 1000:>9.1f} {size / 1024:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video_path")
+    parser.add_argument("--intervals", type=int, nargs="+", default=[60])
+    parser.add_argument("--strategies", nargs="+", default=list(SAMPLING_STRATEGIES),
+                        choices=SAMPLING_STRATEGIES)
+    parser.add_argument("--encode", action="store_true",
+                        help="Benchmark output encodings instead of sampling strategies")
+    parser.add_argument("--formats", nargs="+", default=list(IMAGE_FORMATS),
+                        choices=IMAGE_FORMATS)
+    parser.add_argument("--max-dimensions", type=int, nargs="+", default=[0, 1920, 1280, 640],
+                        help="Longer side in pixels, 0 keeps the full resolution")
+    parser.add_argument("--qualities", type=int, nargs="+", default=[95, 85, 75])
+    parser.add_argument("--sample-frames", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.encode:
+        run_encode(args)
+        return
+
+    cap = cv2.VideoCapture(args.video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    print(f"{'interval':>8} {'strategy':>8} {'saved':>6} {'seconds':>8} "
+          f"{'src fps':>9} {'speedup':>8}")
+    for frame_interval in args.intervals:
+        baseline = None
+        for strategy in args.strategies:
+            saved, elapsed = benchmark(args.video_path, frame_interval, strategy)
+            if baseline is None:
+                baseline = elapsed
+            print(f"{frame_interval:>8} {strategy:>8} {saved:>6} {elapsed:>8.2f} "
+                  f"{total_frames / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,153 @@
-from moviepy import VideoFileClip 
+from moviepy import VideoFileClip
+from moviepy.config import FFMPEG_BINARY
 import os
+import re
+import subprocess
 
-def extract_audio(video_path, output_audio_path):
-    # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_audio_path), exist_ok=True)
+# Output container extension of each extraction mode:
+#   "mp3"    - full-quality MP3 through moviepy (original behaviour)
+#   "speech" - mono 16 kHz low-bitrate Opus, all Whisper needs for speech
+#   "copy"   - demux the source track without re-encoding when Whisper accepts
+#              its codec, otherwise fall back to "speech". The extension is
+#              replaced by the one matching the source codec.
+AUDIO_MODES = {
+    "mp3": ".mp3",
+    "speech": ".ogg",
+    "copy": ".m4a",
+}
+
+SPEECH_SAMPLE_RATE = 16000
+SPEECH_BITRATE = "24k"
+SPEECH_CODEC_ARGS = ["-ac", "1", "-ar", str(SPEECH_SAMPLE_RATE), "-c:a", "libopus",
+                     "-b:a", SPEECH_BITRATE, "-application", "voip"]
+
+# Source codecs Whisper accepts as-is, and the container to copy them into
+STREAM_COPY_CONTAINERS = {
+    "aac": ".m4a",
+    "mp3": ".mp3",
+    "opus": ".ogg",
+    "vorbis": ".ogg",
+    "flac": ".flac",
+}
+
+# Whisper rejects uploads above 25 MB; bigger copies are transcoded instead
+STREAM_COPY_MAX_BYTES = 25 * 1024 * 1024
+
+
+def probe_audio_codec(video_path):
+    """ Return the codec name of the first audio stream, or None if there is none """
+    # ffmpeg prints the stream layout to stderr and exits non-zero without an output
+    result = subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-i", video_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors="replace"
+    )
+    match = re.search(r"Stream #\S+.*?: Audio: (\w+)", result.stderr)
+    return match.group(1) if match else None
+
+
+def probe_duration(media_path):
+    """ Return the duration of the media file in seconds, or None if unknown """
+    result = subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-i", media_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors="replace"
+    )
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def audio_output_args(mode, codec):
+    """ Return (ffmpeg output arguments, file extension) that write the audio
+    track with source codec `codec` in the given mode, for ffmpeg-based modes """
+    if mode == "copy" and codec in STREAM_COPY_CONTAINERS:
+        return ["-c:a", "copy"], STREAM_COPY_CONTAINERS[codec]
+    if mode == "mp3":
+        return ["-c:a", "libmp3lame"], AUDIO_MODES["mp3"]
+    return SPEECH_CODEC_ARGS, AUDIO_MODES["speech"]
+
+
+def enforce_upload_limit(audio_path):
+    """ Transcode the audio file to speech Opus if it exceeds the upload limit.
+
+    Returns the path of the audio file to upload.
+    """
+    if os.path.getsize(audio_path) <= STREAM_COPY_MAX_BYTES:
+        return audio_path
+
+    print("Copied audio exceeds the upload limit, transcoding instead.")
+    base = os.path.splitext(audio_path)[0]
+    tmp_path = base + ".speech" + AUDIO_MODES["speech"]
+    subprocess.run(
+        [FFMPEG_BINARY, "-y", "-loglevel", "error", "-i", audio_path,
+         "-vn"] + SPEECH_CODEC_ARGS + [tmp_path],
+        check=True
+    )
+    os.remove(audio_path)
+    speech_path = base + AUDIO_MODES["speech"]
+    os.replace(tmp_path, speech_path)
+    return speech_path
 
-    # Load video and extract audio
+
+def _extract_speech(video_path, output_audio_path, codec):
+    output_audio_path = os.path.splitext(output_audio_path)[0] + AUDIO_MODES["speech"]
+    subprocess.run(
+        [FFMPEG_BINARY, "-y", "-loglevel", "error", "-i", video_path,
+         "-vn", "-map", "0:a:0"] + SPEECH_CODEC_ARGS + [output_audio_path],
+        check=True
+    )
+    return output_audio_path
+
+
+def _extract_copy(video_path, output_audio_path, codec):
+    container = STREAM_COPY_CONTAINERS.get(codec)
+    if container is None:
+        print(f"Audio codec {codec} cannot be copied, transcoding instead.")
+        return _extract_speech(video_path, output_audio_path, codec)
+
+    output_audio_path = os.path.splitext(output_audio_path)[0] + container
+    subprocess.run(
+        [FFMPEG_BINARY, "-y", "-loglevel", "error", "-i", video_path,
+         "-vn", "-map", "0:a:0", "-c:a", "copy", output_audio_path],
+        check=True
+    )
+    return enforce_upload_limit(output_audio_path)
+
+
+def _extract_mp3(video_path, output_audio_path, codec):
     video = VideoFileClip(video_path)
-    audio = video.audio
+    try:
+        video.audio.write_audiofile(output_audio_path, codec="mp3")
+    finally:
+        # Close the video to free resources
+        video.close()
+    return output_audio_path
 
-    if audio:
-        audio.write_audiofile(output_audio_path, codec="mp3")
-        print(f"Audio extracted and saved to {output_audio_path}")
-    else:
-        print("No audio track found in the video.")
 
-    # Close the video to free resources
-    video.close()
+_EXTRACTORS = {
+    "mp3": _extract_mp3,
+    "speech": _extract_speech,
+    "copy": _extract_copy,
+}
+
+
+def extract_audio(video_path, output_audio_path, mode="mp3"):
+    """ Extract the audio track of the video using the given mode (see AUDIO_MODES).
+
+    Returns the path of the written audio file, or None if the video has no audio.
+    """
+    if mode not in _EXTRACTORS:
+        raise ValueError(f"Unknown audio extraction mode: {mode}")
+
+    # Ensure output directory exists
+    os.makedirs(os.path.dirname(output_audio_path), exist_ok=True)
+
+    codec = probe_audio_codec(video_path)
+    if codec is None:
+        print("No audio track found in the video.")
+        return None
 
+    output_audio_path = _EXTRACTORS[mode](video_path, output_audio_path, codec)
+    print(f"Audio extracted and saved to {output_audio_path}")
+    return output_audio_path
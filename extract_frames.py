@@ -1,25 +1,441 @@
 import cv2
+import functools
+import heapq
+import numpy as np
 import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
 
-def extract_frames(video_path, output_dir, frame_interval=60):
-    os.makedirs(output_dir, exist_ok=True)
-    cap = cv2.VideoCapture(video_path)
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_count = 0
-    extracted_frames = []
+# Sampling strategies:
+#   "read" - decode and convert every frame, keep every Nth (original behaviour)
+#   "grab" - grab() skipped frames without retrieving/converting them
+#   "seek" - jump straight to each sampled timestamp; best for large intervals
+#   "scene" - keyframes at scene/angle changes, at least `frame_interval` apart
+#   "sharpest" - the least blurry frame of every `frame_interval` window
+SAMPLING_STRATEGIES = ("read", "grab", "seek", "scene", "sharpest")
+
+# Scene detection compares small blurred grayscale thumbnails of every
+# SCENE_SAMPLE_STEP-th frame against the last keyframe
+SCENE_SAMPLE_STEP = 5
+SCENE_THRESHOLD = 0.1
+SIGNATURE_SIZE = (64, 36)
+
+# Width of the grayscale thumbnail the blur metric is computed on
+SHARPNESS_WIDTH = 160
+
+# Output image formats and the cv2.imwrite parameter their quality maps to
+IMAGE_FORMATS = {
+    "jpg": cv2.IMWRITE_JPEG_QUALITY,
+    "webp": cv2.IMWRITE_WEBP_QUALITY,
+    "png": None,
+}
+DEFAULT_QUALITY = 95
+PNG_COMPRESSION = 3
+
+# Frames are encoded and written by a pool of threads (OpenCV releases the GIL)
+# fed through a bounded queue, which caps the frames held in memory
+ENCODER_THREADS = min(4, os.cpu_count() or 1)
+ENCODE_QUEUE_DEPTH = 8
+
+# Frames whose dHash differs from an already saved frame by at most this
+# many bits (out of 64) are dropped as near-duplicates
+DEDUP_THRESHOLD = 6
+HASH_SIZE = 8
+
+
+def ahash(frame):
+    """ Average hash: 64 bits telling which 8x8 thumbnail pixels are above the mean """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    thumb = cv2.resize(gray, (HASH_SIZE, HASH_SIZE), interpolation=cv2.INTER_AREA)
+    return _pack_bits(thumb > thumb.mean())
+
+
+def dhash(frame):
+    """ Difference hash: 64 bits comparing horizontally adjacent thumbnail pixels """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    thumb = cv2.resize(gray, (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA)
+    return _pack_bits(thumb[:, 1:] > thumb[:, :-1])
+
+
+def _pack_bits(bits):
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def sharpness(frame):
+    """ Variance of the Laplacian on a downscaled grayscale copy; higher is sharper """
+    height, width = frame.shape[:2]
+    size = (SHARPNESS_WIDTH, max(1, height * SHARPNESS_WIDTH // width))
+    thumb = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+    return cv2.Laplacian(gray, cv2.CV_64F).var()
+
+
+def hamming_distance(hash_a, hash_b):
+    return bin(hash_a ^ hash_b).count("1")
+
+
+def resize_frame(frame, max_dimension):
+    """ Downscale the frame so its longer side is at most `max_dimension` pixels """
+    height, width = frame.shape[:2]
+    scale = max_dimension / max(height, width)
+    if scale >= 1:
+        return frame
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def encode_frame(frame, image_format="jpg", quality=DEFAULT_QUALITY):
+    """ Encode the frame as `image_format` and return the encoded bytes buffer """
+    quality_flag = IMAGE_FORMATS[image_format]
+    if quality_flag is None:
+        params = [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION]
+    else:
+        params = [quality_flag, quality]
+    success, buffer = cv2.imencode(f".{image_format}", frame, params)
+    if not success:
+        raise ValueError(f"Could not encode frame as {image_format}")
+    return buffer
+
+
+class FrameSink:
+    """ Names, deduplicates and writes the frames picked by a sampler.
+
+    With encoder threads, save() only queues the frame so the decode loop
+    never waits for JPEG encoding or disk writes; close() drains the queue.
+    `on_frame(frame_filename, timestamp)` is called once each file is
+    written, from the thread that wrote it.
+    """
+
+    def __init__(self, output_dir, fps, dedup_threshold=None, max_dimension=None,
+                 image_format="jpg", quality=DEFAULT_QUALITY, encoder_threads=ENCODER_THREADS,
+                 on_frame=None):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown image format: {image_format}")
+        self.output_dir = output_dir
+        self.fps = fps
+        self.dedup_threshold = dedup_threshold
+        self.max_dimension = max_dimension
+        self.image_format = image_format
+        self.quality = quality
+        self.on_frame = on_frame
+        self.frames = []
+        self.hash_index = {}
 
-    while True:
+        self._errors = []
+        self._queue = queue.Queue(maxsize=ENCODE_QUEUE_DEPTH) if encoder_threads else None
+        self._workers = [threading.Thread(target=self._encode_worker, daemon=True)
+                         for _ in range(encoder_threads)]
+        for worker in self._workers:
+            worker.start()
+
+    def _write(self, frame, frame_filename, timestamp):
+        encode_frame(frame, self.image_format, self.quality).tofile(frame_filename)
+        if self.on_frame is not None:
+            self.on_frame(frame_filename, timestamp)
+
+    def _encode_worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._write(*item)
+            except Exception as e:
+                self._errors.append(e)
+
+    def close(self):
+        """ Wait for all queued frames to be written, re-raising encoder errors """
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def _is_duplicate(self, frame_hash):
+        return any(hamming_distance(frame_hash, known) <= self.dedup_threshold
+                   for known in self.hash_index.values())
+
+    def save(self, frame, frame_count):
+        # Resize before hashing and encoding so both work on fewer pixels
+        if self.max_dimension is not None:
+            frame = resize_frame(frame, self.max_dimension)
+
+        frame_hash = None
+        if self.dedup_threshold is not None:
+            frame_hash = dhash(frame)
+            if self._is_duplicate(frame_hash):
+                return
+
+        timestamp = frame_count / self.fps
+        frame_filename = (f"{self.output_dir}/frame_{frame_count}_at_{int(timestamp)}s"
+                          f".{self.image_format}")
+        if self._queue is None:
+            self._write(frame, frame_filename, timestamp)
+        else:
+            # Blocks while the queue is full, bounding memory by its depth
+            self._queue.put((frame, frame_filename, timestamp))
+        self.frames.append((frame_filename, timestamp))
+        if frame_hash is not None:
+            self.hash_index[frame_filename] = frame_hash
+
+
+# Samplers process frames [start_frame, end_frame); end_frame None means until
+# the end of the video. The capture is already positioned at start_frame.
+
+def _in_range(frame_count, end_frame):
+    return end_frame is None or frame_count < end_frame
+
+
+def _sample_read(cap, sink, frame_interval, fps, start_frame, end_frame):
+    frame_count = start_frame
+
+    while _in_range(frame_count, end_frame):
         success, frame = cap.read()
         if not success:
             break
 
         if frame_count % frame_interval == 0:
-            timestamp = frame_count / fps
-            frame_filename = f"{output_dir}/frame_{frame_count}_at_{int(timestamp)}s.jpg"
-            cv2.imwrite(frame_filename, frame)
-            extracted_frames.append((frame_filename, timestamp))
+            sink.save(frame, frame_count)
+
+        frame_count += 1
+
+
+def _sample_grab(cap, sink, frame_interval, fps, start_frame, end_frame):
+    frame_count = start_frame
+
+    while _in_range(frame_count, end_frame) and cap.grab():
+        if frame_count % frame_interval == 0:
+            success, frame = cap.retrieve()
+            if not success:
+                break
+            sink.save(frame, frame_count)
+
+        frame_count += 1
+
+
+def _sample_seek(cap, sink, frame_interval, fps, start_frame, end_frame):
+    frame_count = start_frame
+
+    while _in_range(frame_count, end_frame):
+        cap.set(cv2.CAP_PROP_POS_MSEC, frame_count / fps * 1000)
+        success, frame = cap.read()
+        if not success:
+            break
+
+        sink.save(frame, frame_count)
+        frame_count += frame_interval
+
+
+def _sample_sharpest(cap, sink, frame_interval, fps, start_frame, end_frame):
+    frame_count = start_frame
+    best_score, best_frame, best_count = -1.0, None, 0
+
+    while _in_range(frame_count, end_frame):
+        success, frame = cap.read()
+        if not success:
+            break
+
+        score = sharpness(frame)
+        if score > best_score:
+            best_score, best_frame, best_count = score, frame, frame_count
 
         frame_count += 1
+        if frame_count % frame_interval == 0:
+            sink.save(best_frame, best_count)
+            best_score, best_frame = -1.0, None
+
+    # Trailing partial window
+    if best_frame is not None:
+        sink.save(best_frame, best_count)
+
+
+def _signature(frame):
+    thumb = cv2.resize(frame, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+    return cv2.GaussianBlur(gray, (3, 3), 0)
+
+
+def _change_score(signature, reference):
+    # Mean absolute difference of the thumbnails, scaled to 0..1
+    return cv2.absdiff(signature, reference).mean() / 255
+
+
+def _sample_scene(cap, sink, frame_interval, fps, start_frame, end_frame,
+                  max_frames=None, threshold=SCENE_THRESHOLD):
+    # First pass: score scene changes on thumbnails only, nothing is written
+    candidates = []
+    reference = None
+    last_keyframe = None
+    frame_count = start_frame
+
+    while _in_range(frame_count, end_frame) and cap.grab():
+        if frame_count % SCENE_SAMPLE_STEP == 0:
+            success, frame = cap.retrieve()
+            if not success:
+                break
+            signature = _signature(frame)
+            if reference is None:
+                # The opening shot always counts as a keyframe
+                score = 1.0
+            else:
+                score = _change_score(signature, reference)
+
+            if score >= threshold and (last_keyframe is None
+                                       or frame_count - last_keyframe >= frame_interval):
+                candidates.append((score, frame_count))
+                reference = signature
+                last_keyframe = frame_count
+
+        frame_count += 1
+
+    if max_frames is not None:
+        candidates = heapq.nlargest(max_frames, candidates)
+
+    # Second pass: decode and save only the selected keyframes
+    for _, keyframe in sorted(candidates, key=lambda candidate: candidate[1]):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+        success, frame = cap.read()
+        if success:
+            sink.save(frame, keyframe)
+
+
+_SAMPLERS = {
+    "read": _sample_read,
+    "grab": _sample_grab,
+    "seek": _sample_seek,
+    "scene": _sample_scene,
+    "sharpest": _sample_sharpest,
+}
 
+
+def _extract(video_path, output_dir, frame_interval, strategy, max_frames,
+             scene_threshold, frame_range=(0, None), **sink_options):
+    if strategy not in _SAMPLERS:
+        raise ValueError(f"Unknown sampling strategy: {strategy}")
+
+    sampler = _SAMPLERS[strategy]
+    if strategy == "scene":
+        sampler = functools.partial(sampler, max_frames=max_frames, threshold=scene_threshold)
+
+    os.makedirs(output_dir, exist_ok=True)
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    start_frame, end_frame = frame_range
+    if start_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    try:
+        sink = FrameSink(output_dir, fps, **sink_options)
+        try:
+            sampler(cap, sink, frame_interval, fps, start_frame, end_frame)
+        finally:
+            sink.close()
+    finally:
+        cap.release()
+    return sink.frames, sink.hash_index
+
+
+def _segment_ranges(total_frames, frame_interval, segments):
+    # Segment starts are multiples of frame_interval so every segment samples
+    # exactly the frames a sequential pass would
+    length = -(-total_frames // segments)
+    length = -(-length // frame_interval) * frame_interval
+    return [(start, start + length if start + length < total_frames else None)
+            for start in range(0, total_frames, length)]
+
+
+def _extract_parallel(video_path, output_dir, frame_interval, strategy, max_frames,
+                      scene_threshold, workers, **sink_options):
+    if strategy == "scene":
+        raise ValueError("The scene strategy cannot be split into parallel segments")
+
+    # Callbacks cannot cross process boundaries; report the merged frames instead
+    on_frame = sink_options.pop("on_frame", None)
+
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     cap.release()
-    return extracted_frames
+    if total_frames <= 0:
+        # Unknown length, fall back to a single sequential pass
+        return _extract(video_path, output_dir, frame_interval, strategy, max_frames,
+                        scene_threshold, on_frame=on_frame, **sink_options)
+
+    ranges = _segment_ranges(total_frames, frame_interval, workers)
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [executor.submit(_extract, video_path, output_dir, frame_interval, strategy,
+                                   max_frames, scene_threshold, frame_range, **sink_options)
+                   for frame_range in ranges]
+        # Segments are in timeline order, so results merge by concatenation
+        results = [future.result() for future in futures]
+
+    dedup_threshold = sink_options.get("dedup_threshold")
+    extracted_frames = []
+    hash_index = {}
+    for segment_frames, segment_hashes in results:
+        for frame_filename, timestamp in segment_frames:
+            if dedup_threshold is not None:
+                # Segments only deduplicate internally; drop duplicates across them
+                frame_hash = segment_hashes[frame_filename]
+                if any(hamming_distance(frame_hash, known) <= dedup_threshold
+                       for known in hash_index.values()):
+                    os.remove(frame_filename)
+                    continue
+                hash_index[frame_filename] = frame_hash
+            extracted_frames.append((frame_filename, timestamp))
+            if on_frame is not None:
+                on_frame(frame_filename, timestamp)
+    return extracted_frames, hash_index
+
+
+def _run(video_path, output_dir, frame_interval, strategy, max_frames, scene_threshold,
+         workers, **sink_options):
+    if workers > 1:
+        return _extract_parallel(video_path, output_dir, frame_interval, strategy, max_frames,
+                                 scene_threshold, workers, **sink_options)
+    return _extract(video_path, output_dir, frame_interval, strategy, max_frames,
+                    scene_threshold, **sink_options)
+
+
+def extract_frames(video_path, output_dir, frame_interval=60, strategy="grab",
+                   max_frames=None, scene_threshold=SCENE_THRESHOLD, dedup_threshold=None,
+                   max_dimension=None, image_format="jpg", quality=DEFAULT_QUALITY,
+                   encoder_threads=ENCODER_THREADS, workers=1, on_frame=None):
+    """ Save every `frame_interval`-th frame of the video as an image.
+
+    `strategy` selects how skipped frames are handled (see SAMPLING_STRATEGIES).
+    With the "scene" strategy only frames at scene changes scoring at least
+    `scene_threshold` are saved, capped to the `max_frames` strongest changes.
+    With `dedup_threshold` set, frames within that many dHash bits of an
+    already saved frame are dropped before being written.
+    Frames are downscaled to `max_dimension` pixels on their longer side
+    before being encoded as `image_format` (see IMAGE_FORMATS) at `quality`
+    on `encoder_threads` background threads (0 encodes inline).
+    With `workers` > 1 the timeline is split into that many segments decoded
+    by separate processes (not supported by the "scene" strategy).
+    `on_frame(frame_filename, timestamp)` is called as soon as each frame is
+    written (with `workers` > 1, once all segments are done).
+    Returns a list of (frame_filename, timestamp) tuples.
+    """
+    frames, _ = _run(video_path, output_dir, frame_interval, strategy, max_frames,
+                     scene_threshold, workers, dedup_threshold=dedup_threshold,
+                     max_dimension=max_dimension, image_format=image_format,
+                     quality=quality, encoder_threads=encoder_threads, on_frame=on_frame)
+    return frames
+
+
+def extract_unique_frames(video_path, output_dir, frame_interval=60, strategy="grab",
+                          max_frames=None, scene_threshold=SCENE_THRESHOLD,
+                          dedup_threshold=DEDUP_THRESHOLD, max_dimension=None,
+                          image_format="jpg", quality=DEFAULT_QUALITY,
+                          encoder_threads=ENCODER_THREADS, workers=1, on_frame=None):
+    """ Like extract_frames, dropping near-duplicate frames by perceptual hash.
+
+    Returns (extracted_frames, hash_index) where hash_index maps each saved
+    frame_filename to its 64-bit dHash, for reuse by downstream steps.
+    """
+    return _run(video_path, output_dir, frame_interval, strategy, max_frames,
+                scene_threshold, workers, dedup_threshold=dedup_threshold,
+                max_dimension=max_dimension, image_format=image_format,
+                quality=quality, encoder_threads=encoder_threads, on_frame=on_frame)
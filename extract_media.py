@@ -0,0 +1,102 @@
+from moviepy.config import FFMPEG_BINARY
+import numpy as np
+import os
+import re
+import subprocess
+import tempfile
+
+from extract_audio import AUDIO_MODES, audio_output_args, enforce_upload_limit
+from extract_frames import DEFAULT_QUALITY, ENCODER_THREADS, FrameSink
+
+
+def probe_media(video_path):
+    """ Return (audio codec or None, (width, height), fps) of the first streams.
+
+    The size is the displayed one: ffmpeg applies the rotation metadata when
+    decoding, so a 90 degree rotation swaps width and height.
+    """
+    result = subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-i", video_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors="replace"
+    )
+    video = re.search(r"Stream #\S+.*?: Video: .*?, (\d+)x(\d+)[ ,].*?([\d.]+)(k?) (?:fps|tbr)",
+                      result.stderr)
+    if not video:
+        raise ValueError(f"No video stream found in {video_path}")
+    width, height = int(video.group(1)), int(video.group(2))
+    fps = float(video.group(3)) * (1000 if video.group(4) else 1)
+
+    rotation = re.search(r"rotation of (-?[\d.]+) degrees", result.stderr)
+    if rotation and round(float(rotation.group(1))) % 180 == 90:
+        width, height = height, width
+
+    audio = re.search(r"Stream #\S+.*?: Audio: (\w+)", result.stderr)
+    return (audio.group(1) if audio else None), (width, height), fps
+
+
+def extract_media(video_path, output_dir, output_audio_path, frame_interval=60,
+                  audio_mode="copy", dedup_threshold=None, max_dimension=None,
+                  image_format="jpg", quality=DEFAULT_QUALITY, encoder_threads=ENCODER_THREADS,
+                  on_frame=None):
+    """ Extract frames and audio in a single pass over the video.
+
+    One ffmpeg process demuxes the container once, writes the audio track
+    in `audio_mode` (see AUDIO_MODES) and pipes every `frame_interval`-th
+    decoded frame to a FrameSink, instead of extract_frames and
+    extract_audio each reading the whole file. Frames are sampled like the
+    "read" strategy; the other frame options match extract_frames.
+    Returns (extracted_frames, audio_path) where audio_path is None if the
+    video has no audio.
+    """
+    if audio_mode not in AUDIO_MODES:
+        raise ValueError(f"Unknown audio extraction mode: {audio_mode}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(os.path.dirname(output_audio_path), exist_ok=True)
+
+    codec, (width, height), fps = probe_media(video_path)
+    command = [FFMPEG_BINARY, "-y", "-loglevel", "error", "-i", video_path]
+
+    audio_path = None
+    if codec is None:
+        print("No audio track found in the video.")
+    else:
+        codec_args, extension = audio_output_args(audio_mode, codec)
+        audio_path = os.path.splitext(output_audio_path)[0] + extension
+        command += ["-map", "0:a:0", "-vn"] + codec_args + [audio_path]
+
+    # Only the sampled frames are converted to BGR and sent through the pipe
+    command += ["-map", "0:v:0", "-an", "-vf", f"select=not(mod(n\\,{frame_interval}))",
+                "-fps_mode", "passthrough", "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1"]
+
+    frame_size = width * height * 3
+    sink = FrameSink(output_dir, fps, dedup_threshold=dedup_threshold,
+                     max_dimension=max_dimension, image_format=image_format,
+                     quality=quality, encoder_threads=encoder_threads, on_frame=on_frame)
+    # stderr goes to a file: a full stderr pipe would block ffmpeg while we
+    # wait on stdout (e.g. per-frame decode errors of a damaged upload)
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+        try:
+            frame_count = 0
+            while True:
+                data = process.stdout.read(frame_size)
+                if len(data) < frame_size:
+                    break
+                frame = np.frombuffer(data, np.uint8).reshape(height, width, 3)
+                sink.save(frame, frame_count)
+                frame_count += frame_interval
+        finally:
+            sink.close()
+            process.stdout.close()
+            process.wait()
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+            raise RuntimeError(f"ffmpeg failed on {video_path}: {stderr.strip()}")
+
+    if audio_path is not None:
+        if audio_mode == "copy":
+            audio_path = enforce_upload_limit(audio_path)
+        print(f"Audio extracted and saved to {audio_path}")
+    return sink.frames, audio_path
@@ -0,0 +1,66 @@
+import logging
+import os
+import shutil
+import time
+import uuid
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+JOBS_DIR = "outputs/jobs"
+
+# Cleanup policy applied whenever a new workspace is created. Workspaces
+# expire by age only: a count limit would delete ones still in use.
+JOB_MAX_AGE_SECONDS = 24 * 3600
+
+
+def create_job_dir(root: str = JOBS_DIR, cleanup: bool = True) -> str:
+    """Create a fresh, uniquely named output workspace for one processing job.
+
+    Args:
+        root: Directory holding all job workspaces
+        cleanup: Apply the cleanup policy to older workspaces first
+
+    Returns:
+        str: Path of the new workspace
+    """
+    if cleanup:
+        cleanup_jobs(root)
+    job_dir = os.path.join(root, f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}")
+    os.makedirs(job_dir)
+    return job_dir
+
+
+def touch_job_dir(job_dir: str) -> None:
+    """Mark a workspace as recently used so cleanup keeps it."""
+    os.makedirs(job_dir, exist_ok=True)
+    os.utime(job_dir)
+
+
+def cleanup_jobs(root: str = JOBS_DIR, max_age_seconds: float = JOB_MAX_AGE_SECONDS) -> List[str]:
+    """Delete workspaces unused for longer than `max_age_seconds`.
+
+    Args:
+        root: Directory holding all job workspaces
+        max_age_seconds: Maximum time since a workspace was last used
+
+    Returns:
+        list: Paths of the deleted workspaces
+    """
+    if not os.path.isdir(root):
+        return []
+
+    now = time.time()
+    expired = []
+    for entry in os.scandir(root):
+        try:
+            if entry.is_dir() and now - entry.stat().st_mtime > max_age_seconds:
+                expired.append(entry.path)
+        except OSError:
+            # Removed by a concurrent cleanup
+            continue
+
+    for path in expired:
+        shutil.rmtree(path, ignore_errors=True)
+        logger.info(f"Removed job workspace {path}")
+    return expired
@@ -1,11 +1,24 @@
 import os
+import asyncio
+import functools
+import hashlib
+import json
 import logging
-from typing import List, Dict, Tuple, Optional
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, List, Dict, Tuple, Optional
 import streamlit as st
-from openai import OpenAI
+from openai import AsyncOpenAI
+from openai_client import get_async_client, iterate_async, metrics, run_coroutine
 from extract_frames import extract_frames
-from extract_audio import extract_audio
-from transcribe_audio import transcribe
+from extract_audio import AUDIO_MODES, extract_audio
+from transcribe_audio import WHISPER_MODEL, transcribe_async
+from result_cache import (DESCRIPTION_CACHE_DIR, HASH_CHUNK_SIZE, TRANSCRIPT_CACHE_DIR,
+                          ResultCache, TextCache, hash_file, hash_text, make_key, make_text_key)
+from job_workspace import create_job_dir, touch_job_dir
+from translation_memory import TranslationBatch, TranslationMemory
+from pipeline_planner import PipelinePlan, plan_pipeline
+from token_counter import count_tokens, split_by_tokens
 from langdetect import detect
 
 # Configure logging
@@ -15,26 +28,184 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+GPT_MODEL = "gpt-4"
+
+DESCRIPTION_PROMPT = """
+            Create a concise product description in {language} based on this video transcript.
+            Format the description as line-by-line bullet points:
+            - Product name and type
+            - Key features (one per line)
+            - Condition
+            - Age suitability (if mentioned)
+            - Price (if mentioned)
+            
+            Keep it brief and factual. Use simple language. Only include information from the transcript.
+            Start each line with a hyphen and space.
+            
+            Transcript:
+            {transcript}
+            """
+
+# Map step for long transcripts: each chunk is reduced to its key facts, and
+# the joined facts are described in place of the transcript
+FACTS_PROMPT = """
+            Extract the key facts about the product from this excerpt of a video transcript:
+            product name and type, brand, features and specifications, condition, age,
+            included accessories and price. Write them as short bullet points starting
+            with a hyphen and space. Only include information from the excerpt; reply
+            with nothing if it contains none.
+            
+            Excerpt:
+            {transcript}
+            """
+
+# Transcripts above MAX_TRANSCRIPT_TOKENS are condensed into key facts,
+# TRANSCRIPT_CHUNK_TOKENS at a time, at most FACT_EXTRACTION_WORKERS chunks
+# in flight
+MAX_TRANSCRIPT_TOKENS = 3000
+TRANSCRIPT_CHUNK_TOKENS = 2000
+FACT_EXTRACTION_WORKERS = 8
+
+# Part of the description cache key; bump whenever DESCRIPTION_PROMPT or
+# FACTS_PROMPT changes
+DESCRIPTION_PROMPT_VERSION = 3
+
+# Languages offered in the app; the names are also used in the description prompt
+LANGUAGE_NAMES = {
+    "en": "English",
+    "de": "German",
+    "fr": "French",
+    "es": "Spanish",
+    "it": "Italian",
+}
+
+# Pipeline stages reported to the progress callback, in display order
+PIPELINE_STAGES = {
+    "frames": "Extracting frames",
+    "audio": "Extracting audio",
+    "transcription": "Transcribing audio",
+    "translation": "Translating transcription",
+    "description": "Generating description",
+}
+
+# Signature of progress callbacks: (stage, status) with status one of
+# "running", "done", "skipped", "cached" or "failed"
+ProgressCallback = Callable[[str, str], None]
+
+# Signature of description callbacks: (lang, description text so far), called
+# as streamed completion tokens arrive
+DescriptionCallback = Callable[[str, str], None]
+
+
+class PipelineEvent:
+    """One intermediate result of the pipeline, as soon as it is available."""
+
+    def __init__(self, kind: str, value, lang: Optional[str] = None):
+        """Describe a result of the given kind:
+
+        - "progress": (stage, status), as passed to progress callbacks
+        - "frame": (frame_filename, timestamp) of a saved frame
+        - "audio": path of the extracted audio
+        - "transcript": transcript in `lang`
+        - "description_partial": description in `lang` streamed so far
+        - "description": final description in `lang`
+        - "done": dict of target language -> (transcript, description)
+        """
+        self.kind = kind
+        self.value = value
+        self.lang = lang
+
+    def __repr__(self) -> str:
+        return f"PipelineEvent({self.kind!r}, lang={self.lang!r})"
+
+
+# Signature of event callbacks, receiving every PipelineEvent
+EventCallback = Callable[[PipelineEvent], None]
+
+# Columns of the frame gallery shown while the video is processed
+GALLERY_COLUMNS = 6
+
 class VideoProcessor:
     """A class to handle video processing including frame extraction, audio transcription,
     and description generation."""
     
-    def __init__(self, video_path: str):
-        """Initialize the VideoProcessor with video path and output directories."""
+    def __init__(self, video_path: str, frame_interval: int = 60,
+                 frame_strategy: str = "sharpest", frame_max_dimension: Optional[int] = 1920,
+                 frame_quality: int = 85, frame_workers: int = 1, audio_mode: str = "copy",
+                 cache: Optional[ResultCache] = None, video_hash: Optional[str] = None,
+                 async_client: Optional[AsyncOpenAI] = None,
+                 output_dir: Optional[str] = None, executor: Optional[Executor] = None,
+                 transcript_cache: Optional[TextCache] = None,
+                 description_cache: Optional[TextCache] = None,
+                 translation_memory: Optional[TranslationMemory] = None,
+                 translate_transcript: bool = True):
+        """Initialize the VideoProcessor with video path and output directories.
+
+        Args:
+            video_path: Path of the video to process
+            frame_interval: Save every Nth frame
+            frame_strategy: Frame sampling strategy, see
+                extract_frames.SAMPLING_STRATEGIES; "sharpest" keeps the least
+                blurry frame of each interval
+            frame_max_dimension: Longer side of the saved frames in pixels,
+                None keeps the source resolution
+            frame_quality: JPEG quality of the saved frames
+            frame_workers: Processes decoding segments of the video in parallel
+            audio_mode: Audio extraction mode, see extract_audio.AUDIO_MODES
+            cache: Optional result cache consulted before running the pipeline
+            video_hash: Content hash of the video, computed on demand if omitted
+            async_client: AsyncOpenAI client used by the async pipeline,
+                defaults to the shared client of the running event loop
+            output_dir: Root directory of the frames, audio, transcript and
+                description outputs; defaults to a new job workspace so
+                concurrent processors never share files
+            executor: Executor running frame and audio extraction, e.g. a
+                process pool; defaults to the event loop's default executor
+            transcript_cache: Optional cache of transcripts keyed by the
+                extracted audio bytes, shared across videos
+            description_cache: Optional cache of descriptions keyed by
+                transcript, language and prompt version, shared across videos
+            translation_memory: Optional sentence-level translation memory
+                shared across videos
+            translate_transcript: Translate the transcript into each target
+                language; when False (transcript not displayed) only the
+                descriptions are produced per language
+        """
         self.video_path = video_path
-        self.frames_dir = "outputs/frames/"
-        self.audio_path = "outputs/audio/audio.mp3"
-        self.transcripts_path = "outputs/transcripts/transcript.txt"
-        self.description_path = "outputs/description/description.txt"
+        self.frame_interval = frame_interval
+        self.frame_strategy = frame_strategy
+        self.frame_max_dimension = frame_max_dimension
+        self.frame_quality = frame_quality
+        self.frame_workers = frame_workers
+        self.audio_mode = audio_mode
+        self.cache = cache
+        self.video_hash = video_hash
+        self.async_client = async_client
+        self.executor = executor
+        self.transcript_cache = transcript_cache
+        self.description_cache = description_cache
+        self.translation_memory = translation_memory
+        self.translate_transcript = translate_transcript
+        self.plan: Optional[PipelinePlan] = None
+        self.output_dir = output_dir if output_dir is not None else create_job_dir()
+        self.frames_dir = os.path.join(self.output_dir, "frames")
+        self.audio_path = os.path.join(self.output_dir, "audio", f"audio{AUDIO_MODES[audio_mode]}")
+        self.transcripts_dir = os.path.join(self.output_dir, "transcripts")
+        self.description_dir = os.path.join(self.output_dir, "description")
+        self.extracted_frames: List[Tuple[str, float]] = []
+        self.transcript: Optional[str] = None
         
         # Create output directories if they don't exist
         for path in [self.frames_dir, os.path.dirname(self.audio_path),
-                    os.path.dirname(self.transcripts_path),
-                    os.path.dirname(self.description_path)]:
+                    self.transcripts_dir, self.description_dir]:
             os.makedirs(path, exist_ok=True)
 
     def generate_description(self, transcript: str, target_lang: str) -> str:
         """Generate a product description using GPT-4 based on video transcript.
+
+        The description is written directly in the target language, one
+        request. Thin synchronous wrapper around generate_description_async,
+        see process_video.
         
         Args:
             transcript: The full text transcript of the video
@@ -43,109 +214,798 @@ class VideoProcessor:
         Returns:
             str: Generated product description in target language
         """
+        return run_coroutine(self.generate_description_async(transcript, target_lang))
+
+    async def generate_description_async(self, transcript: str, target_lang: str) -> str:
+        """Async variant of generate_description, the one making the request.
+
+        Args:
+            transcript: The full text transcript of the video
+            target_lang: Target language code (e.g. 'en', 'de')
+
+        Returns:
+            str: Generated product description in target language
+        """
+        return await self._describe_async(transcript, target_lang)
+
+    def stream_description(self, transcript: str, target_lang: str) -> Iterator[str]:
+        """Streaming variant of generate_description: yield the description
+        piece by piece as the completion tokens arrive, then save it.
+
+        Thin synchronous wrapper around stream_description_async, see
+        process_video.
+
+        Args:
+            transcript: The full text transcript of the video
+            target_lang: Target language code (e.g. 'en', 'de')
+
+        Yields:
+            str: The next piece of the description
+        """
+        yield from iterate_async(self.stream_description_async(transcript, target_lang))
+
+    async def stream_description_async(self, transcript: str,
+                                       target_lang: str) -> AsyncIterator[str]:
+        """Async variant of stream_description, the one making the request."""
+        parts = []
+        async for delta in self._description_deltas_async(transcript, target_lang):
+            parts.append(delta)
+            yield delta
+        self._save_description("".join(parts), target_lang)
+
+    async def generate_descriptions_async(self, transcript: str, target_langs: List[str],
+                                          direct: Optional[bool] = None,
+                                          on_description: Optional[DescriptionCallback] = None
+                                          ) -> Dict[str, str]:
+        """Generate the descriptions of several target languages concurrently.
+
+        Args:
+            transcript: The full text transcript of the video
+            target_langs: Target language codes (e.g. ['en', 'de'])
+            direct: Write each description directly in its language; if
+                False, write one English description and translate it. None
+                lets the pipeline planner choose.
+            on_description: Optional callback receiving each description as
+                it streams in; translated descriptions arrive whole
+
+        Returns:
+            dict: Target language -> generated product description
+        """
+        if direct is None:
+            direct = self._plan(transcript, None, target_langs, translate_transcript=False).direct
+
+        # Condense a long transcript once for all the description requests
+        source = None
+        if any(self._cached_description(transcript, lang) is None
+               for lang in (target_langs if direct else ["en"])):
+            source = await self._condense_async(transcript)
+
+        if direct:
+            descriptions = await asyncio.gather(*(
+                self._describe_async(transcript, lang, source, on_description)
+                for lang in target_langs
+            ))
+            return dict(zip(target_langs, descriptions))
+
+        # Only stream the English master if it is displayed itself
+        description = await self._describe_async(
+            transcript, "en", source, on_description if "en" in target_langs else None
+        )
+        descriptions = {lang: description for lang in target_langs}
+        foreign = [lang for lang in target_langs if lang != "en"]
+        translated = await asyncio.gather(*(
+            self.translate_text_async(description, lang) for lang in foreign
+        ))
+        descriptions.update(zip(foreign, translated))
+        if on_description is not None:
+            for lang in foreign:
+                on_description(lang, descriptions[lang])
+        return descriptions
+
+    async def _describe_async(self, transcript: str, lang: str, source: Optional[str] = None,
+                              on_description: Optional[DescriptionCallback] = None) -> str:
+        """Write the description in `lang` with a single request, or serve it
+        from the description cache.
+
+        With `on_description` the completion is streamed and the callback
+        receives the text generated so far after every piece.
+
+        Args:
+            transcript: The full text transcript of the video
+            lang: Language code of the description
+            source: Text the description is written from, the transcript
+                condensed by _condense_async if omitted
+            on_description: Optional callback receiving (lang, text so far)
+
+        Returns:
+            str: Generated product description
+        """
+        if on_description is not None:
+            parts = []
+            async for delta in self._description_deltas_async(transcript, lang, source):
+                parts.append(delta)
+                on_description(lang, "".join(parts))
+            return "".join(parts)
+
         try:
-            # First generate description in English
-            prompt = """
-            Create a concise product description in English based on this video transcript.
-            Format the description as line-by-line bullet points:
-            - Product name and type
-            - Key features (one per line)
-            - Condition
-            - Age suitability (if mentioned)
-            - Price (if mentioned)
-            
-            Keep it brief and factual. Use simple language. Only include information from the transcript.
-            Start each line with a hyphen and space.
-            
-            Transcript:
-            {transcript}
-            """
-            
-            client = OpenAI()
-            
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": prompt.format(transcript=transcript)}],
-                temperature=0.7
+            description = self._cached_description(transcript, lang)
+            if description is not None:
+                logger.info(f"Description ({lang}) served from cache")
+                return description
+
+            if source is None:
+                source = await self._condense_async(transcript)
+            response = await self._get_async_client().chat.completions.create(
+                **self._description_request(source, lang)
             )
-            
             description = response.choices[0].message.content
-            
-            # Translate to target language if needed
-            if target_lang != "en":
-                description = self.translate_text(description, target_lang)
-            
+            self._store_description(transcript, lang, description)
             return description
         except Exception as e:
             logger.error(f"Failed to generate description: {str(e)}")
             raise
 
-    def process_video(self, target_lang: str) -> Tuple[List[Dict], str]:
+    async def _description_deltas_async(self, transcript: str, lang: str,
+                                        source: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield the description in `lang` in pieces as the streamed completion
+        arrives (a cached description as a single piece), caching the result.
+
+        Args:
+            transcript: The full text transcript of the video
+            lang: Language code of the description
+            source: Text the description is written from, the transcript
+                condensed by _condense_async if omitted
+
+        Yields:
+            str: The next piece of the description
+        """
+        try:
+            description = self._cached_description(transcript, lang)
+            if description is not None:
+                logger.info(f"Description ({lang}) served from cache")
+                yield description
+                return
+
+            if source is None:
+                source = await self._condense_async(transcript)
+            stream = await self._get_async_client().chat.completions.create(
+                **self._description_request(source, lang), stream=True
+            )
+            parts = []
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            self._store_description(transcript, lang, "".join(parts))
+        except Exception as e:
+            logger.error(f"Failed to generate description: {str(e)}")
+            raise
+
+    async def _condense_async(self, transcript: str) -> str:
+        """Reduce a transcript above MAX_TRANSCRIPT_TOKENS to its key facts.
+
+        The transcript is cut into chunks whose facts are extracted
+        concurrently (at most FACT_EXTRACTION_WORKERS requests in flight),
+        repeated on the joined facts until they fit, so the description
+        request stays bounded regardless of the video length.
+
+        Args:
+            transcript: The full text transcript of the video
+
+        Returns:
+            str: The transcript itself if short enough, otherwise its key facts
+        """
+        semaphore = asyncio.Semaphore(FACT_EXTRACTION_WORKERS)
+        tokens = count_tokens(transcript, GPT_MODEL)
+        while tokens > MAX_TRANSCRIPT_TOKENS:
+            chunks = split_by_tokens(transcript, TRANSCRIPT_CHUNK_TOKENS, GPT_MODEL)
+            logger.info(f"Condensing a transcript of {tokens} tokens in {len(chunks)} chunks")
+            facts = await asyncio.gather(*(
+                self._extract_facts_async(chunk, semaphore) for chunk in chunks
+            ))
+            condensed = "\n".join(fact.strip() for fact in facts if fact.strip())
+            condensed_tokens = count_tokens(condensed, GPT_MODEL)
+            if condensed_tokens >= tokens:
+                break
+            transcript, tokens = condensed, condensed_tokens
+        return transcript
+
+    async def _extract_facts_async(self, chunk: str, semaphore: asyncio.Semaphore) -> str:
+        """Extract the key facts of one transcript chunk, holding `semaphore`
+        during the request."""
+        async with semaphore:
+            response = await self._get_async_client().chat.completions.create(
+                **self._facts_request(chunk)
+            )
+        return response.choices[0].message.content or ""
+
+    def _plan(self, transcript: str, source_lang: Optional[str], target_langs: List[str],
+              translate_transcript: bool) -> PipelinePlan:
+        """Choose the cheapest way to produce the requested outputs, see
+        pipeline_planner.plan_pipeline."""
+        plan = plan_pipeline(transcript, source_lang, target_langs, translate_transcript,
+                             description_prompt_tokens=count_tokens(DESCRIPTION_PROMPT),
+                             max_transcript_tokens=MAX_TRANSCRIPT_TOKENS,
+                             chunk_tokens=TRANSCRIPT_CHUNK_TOKENS,
+                             facts_prompt_tokens=count_tokens(FACTS_PROMPT))
+        logger.info(f"Using plan {plan}")
+        return plan
+
+    def process_video(self, target_lang: str,
+                      progress: Optional[ProgressCallback] = None) -> Tuple[str, str]:
         """Process the video through the full pipeline.
-        
+
+        Thin synchronous wrapper around process_video_async, run on the
+        shared background event loop so its pooled async client is reused.
+
         Args:
             target_lang: Selected target language for transcription
-            
+            progress: Optional callback receiving (stage, status) updates
+
+        Returns:
+            tuple: (transcript, description)
+        """
+        return run_coroutine(self.process_video_async(target_lang, progress=progress))
+
+    async def process_video_async(self, target_lang: str,
+                                  progress: Optional[ProgressCallback] = None) -> Tuple[str, str]:
+        """Process the video for a single target language, see process_languages_async.
+
+        Args:
+            target_lang: Selected target language for transcription
+            progress: Optional callback receiving (stage, status) updates
+
+        Returns:
+            tuple: (transcript, description)
+        """
+        results = await self.process_languages_async([target_lang], progress=progress)
+        return results[target_lang]
+
+    def process_languages(self, target_langs: List[str],
+                          progress: Optional[ProgressCallback] = None,
+                          on_description: Optional[DescriptionCallback] = None,
+                          on_event: Optional[EventCallback] = None
+                          ) -> Dict[str, Tuple[str, str]]:
+        """Process the video for several target languages at once.
+
+        Thin synchronous wrapper around process_languages_async, see
+        process_video.
+
+        Args:
+            target_langs: Target language codes (e.g. ['en', 'de'])
+            progress: Optional callback receiving (stage, status) updates
+            on_description: Optional callback receiving the descriptions as
+                they stream in
+            on_event: Optional callback receiving every PipelineEvent
+
+        Returns:
+            dict: Target language -> (transcript, description)
+        """
+        return run_coroutine(self.process_languages_async(target_langs, progress=progress,
+                                                          on_description=on_description,
+                                                          on_event=on_event))
+
+    def events(self, target_langs: List[str]) -> Iterator[PipelineEvent]:
+        """Process the video, yielding each result as soon as it is available.
+
+        The pipeline runs on the shared background event loop, so the
+        caller (e.g. a Streamlit script) consumes the events from its own
+        thread. The last event is "done"; pipeline errors are raised from
+        the generator.
+
+        Args:
+            target_langs: Target language codes (e.g. ['en', 'de'])
+
+        Yields:
+            PipelineEvent: Frames, audio, transcripts and descriptions in the
+                order they are produced, interleaved with progress updates
+        """
+        yield from iterate_async(self.events_async(target_langs))
+
+    async def events_async(self, target_langs: List[str]) -> AsyncIterator[PipelineEvent]:
+        """Async counterpart of events(), running the pipeline on the current
+        event loop.
+
+        Args:
+            target_langs: Target language codes (e.g. ['en', 'de'])
+
+        Yields:
+            PipelineEvent: Results in the order they are produced
+        """
+        pending = asyncio.Queue()
+        task = asyncio.ensure_future(
+            self.process_languages_async(target_langs, on_event=pending.put_nowait)
+        )
+        task.add_done_callback(lambda _: pending.put_nowait(None))
+        try:
+            while True:
+                event = await pending.get()
+                if event is None:
+                    break
+                yield event
+            # Surface any pipeline error
+            task.result()
+        finally:
+            task.cancel()
+
+    async def process_languages_async(self, target_langs: List[str],
+                                      progress: Optional[ProgressCallback] = None,
+                                      on_description: Optional[DescriptionCallback] = None,
+                                      on_event: Optional[EventCallback] = None
+                                      ) -> Dict[str, Tuple[str, str]]:
+        """Process the video through the full pipeline on the running event loop.
+
+        OpenCV and ffmpeg work runs in the extraction executor and the API calls
+        use the async OpenAI client. The frame pass runs concurrently with
+        audio extraction, transcription and description, so the wall-clock
+        time is roughly max(frames, audio + API calls) instead of their sum.
+        Frames, audio and transcription are produced once; only the
+        description and translation requests fan out per target language,
+        concurrently. When the cache holds the video for some of the
+        languages only, its frames, audio and transcript are reused and just
+        the missing languages are produced.
+
+        Args:
+            target_langs: Target language codes (e.g. ['en', 'de'])
+            progress: Optional callback receiving (stage, status) updates. It
+                is always called from the event loop thread.
+            on_description: Optional callback receiving (lang, text so far)
+                while the descriptions stream in, also from the event loop
+                thread. Not called for results served from the cache.
+            on_event: Optional callback receiving a PipelineEvent for every
+                intermediate result, from the event loop thread. Results
+                served from the cache are replayed as events too.
+
         Returns:
-            tuple: (transcripts, description) where:
-                - transcripts: List of transcription segments
-                - description: Generated product description
+            dict: Target language -> (transcript, description)
         """
+        emit = on_event or (lambda event: None)
+        notify = progress or (lambda stage, status: None)
+        report, describe = notify, on_description
+        if on_event is not None:
+            def report(stage: str, status: str) -> None:
+                notify(stage, status)
+                emit(PipelineEvent("progress", (stage, status)))
+
+            def describe(lang: str, text: str) -> None:
+                if on_description is not None:
+                    on_description(lang, text)
+                emit(PipelineEvent("description_partial", text, lang))
+
+        loop = asyncio.get_running_loop()
+        target_langs = list(dict.fromkeys(target_langs))
+
+        cache_key = None
+        partial = None
+        if self.cache is not None:
+            cache_key = await loop.run_in_executor(None, self._cache_key)
+            cached = await loop.run_in_executor(None, self.cache.get, cache_key)
+            if cached is not None:
+                missing = [lang for lang in target_langs if lang not in cached["results"]]
+                if not missing:
+                    logger.info(f"Cache hit for {self.video_path}")
+                    results = self._restore_cached(cached, target_langs, report, emit)
+                    emit(PipelineEvent("done", results))
+                    return results
+                if cached["transcript"] is not None or cached["audio_path"]:
+                    logger.info(f"Partial cache hit for {self.video_path}, "
+                                f"processing {', '.join(missing)}")
+                    partial = cached
+
         try:
-            # Extract frames
-            with st.spinner("Extracting frames..."):
-                extract_frames(self.video_path, self.frames_dir, frame_interval=60)
-                logger.info(f"Extracted frames to {self.frames_dir}")
-
-            # Extract audio
-            with st.spinner("Extracting audio..."):
-                extract_audio(self.video_path, self.audio_path)
-                logger.info(f"Extracted audio to {self.audio_path}")
-
-            # Transcribe audio
-            with st.spinner("Transcribing audio..."):
-                transcript = transcribe(self.audio_path)
-                
-                # Detect and translate if needed
-                detected_lang = self.detect_language(transcript)
-                if detected_lang and detected_lang != target_lang:
-                    with st.spinner("Translating transcription..."):
-                        transcript = self.translate_text(
-                            transcript,
-                            target_lang
-                        )
-                
-                self._save_transcripts(transcript)
-                logger.info(f"Saved transcripts to {self.transcripts_path}")
-
-            # Generate description
-            with st.spinner("Generating description..."):
-                description = self.generate_description(transcript, target_lang)
-                self._save_description(description)
-                logger.info(f"Saved description to {self.description_path}")
-            
-            return transcript, description
-            
+            if partial is not None:
+                results = await self._extend_cached_async(partial, target_langs, report,
+                                                          describe, emit)
+            else:
+                frames_task = asyncio.ensure_future(self._extract_frames_async(report, emit))
+                try:
+                    results = await self._process_audio_async(target_langs, report, describe,
+                                                              emit)
+                except BaseException:
+                    # Fail right away with the first error; the frames are not needed
+                    frames_task.cancel()
+                    raise
+                self.extracted_frames = await frames_task
+
+            if cache_key is not None:
+                try:
+                    await loop.run_in_executor(None, functools.partial(
+                        self.cache.put, cache_key, self.extracted_frames, self.audio_path,
+                        results, transcript=self.transcript
+                    ))
+                except Exception as e:
+                    # The results are complete; a failed cache write only costs a rerun
+                    logger.warning(f"Failed to cache results of {self.video_path}: {str(e)}")
+
+            logger.info(f"OpenAI connection reuse: {metrics}")
+            emit(PipelineEvent("done", results))
+            return results
+
         except Exception as e:
             logger.error(f"Video processing failed: {str(e)}")
             raise
 
-    def _save_transcripts(self, transcript: str) -> None:
+    async def _process_audio_async(self, target_langs: List[str], report: ProgressCallback,
+                                   on_description: Optional[DescriptionCallback] = None,
+                                   emit: Optional[EventCallback] = None
+                                   ) -> Dict[str, Tuple[str, str]]:
+        """Extract and transcribe the audio, then generate the descriptions.
+
+        Args:
+            target_langs: Target language codes
+            report: Progress callback receiving (stage, status) updates
+            on_description: Optional callback receiving the streamed descriptions
+            emit: Optional callback receiving the audio, transcript and
+                description events
+
+        Returns:
+            dict: Target language -> (transcript, description)
+
+        Raises:
+            ValueError: If the video has no audio track
+        """
+        emit = emit or (lambda event: None)
+        loop = asyncio.get_running_loop()
+
+        # Extract audio
+        report("audio", "running")
+        audio_path = await loop.run_in_executor(
+            self.executor, functools.partial(extract_audio, self.video_path, self.audio_path,
+                                    mode=self.audio_mode)
+        )
+        if audio_path is None:
+            report("audio", "failed")
+            raise ValueError(f"{self.video_path} has no audio track to transcribe")
+        self.audio_path = audio_path
+        logger.info(f"Extracted audio to {self.audio_path}")
+        report("audio", "done")
+        emit(PipelineEvent("audio", self.audio_path))
+
+        # Transcribe audio
+        report("transcription", "running")
+        self.transcript = await transcribe_async(self.audio_path, client=self.async_client,
+                                                 cache=self.transcript_cache)
+        report("transcription", "done")
+
+        return await self._describe_transcript_async(self.transcript, target_langs, report,
+                                                     on_description, emit)
+
+    async def _extend_cached_async(self, cached: Dict, target_langs: List[str],
+                                   report: ProgressCallback,
+                                   on_description: Optional[DescriptionCallback] = None,
+                                   emit: Optional[EventCallback] = None
+                                   ) -> Dict[str, Tuple[str, str]]:
+        """Produce the languages missing from a cache entry from its frames,
+        audio and transcript, without extracting anything again.
+
+        Entries written before the transcript was cached get their cached
+        audio transcribed again (normally a transcript cache hit).
+
+        Args:
+            cached: Result returned by ResultCache.get
+            target_langs: Target language codes, some of them in the cache entry
+            report: Progress callback receiving (stage, status) updates
+            on_description: Optional callback receiving the streamed descriptions
+            emit: Optional callback receiving the cached and new results as events
+
+        Returns:
+            dict: Target language -> (transcript, description)
+        """
+        emit = emit or (lambda event: None)
+        self.extracted_frames = cached["frames"]
+        if cached["audio_path"]:
+            self.audio_path = cached["audio_path"]
+        for stage in ("frames", "audio"):
+            report(stage, "cached")
+        for frame_filename, timestamp in self.extracted_frames:
+            emit(PipelineEvent("frame", (frame_filename, timestamp)))
+        if cached["audio_path"]:
+            emit(PipelineEvent("audio", self.audio_path))
+
+        self.transcript = cached["transcript"]
+        if self.transcript is not None:
+            report("transcription", "cached")
+        else:
+            report("transcription", "running")
+            self.transcript = await transcribe_async(self.audio_path, client=self.async_client,
+                                                     cache=self.transcript_cache)
+            report("transcription", "done")
+
+        results = {lang: cached["results"][lang] for lang in target_langs
+                   if lang in cached["results"]}
+        for lang, (transcript, description) in results.items():
+            self._save_transcripts(transcript, lang)
+            self._save_description(description, lang)
+            emit(PipelineEvent("transcript", transcript, lang))
+            emit(PipelineEvent("description", description, lang))
+
+        missing = [lang for lang in target_langs if lang not in results]
+        results.update(await self._describe_transcript_async(self.transcript, missing, report,
+                                                             on_description, emit))
+        return {lang: results[lang] for lang in target_langs}
+
+    async def _describe_transcript_async(self, transcript: str, target_langs: List[str],
+                                         report: ProgressCallback,
+                                         on_description: Optional[DescriptionCallback] = None,
+                                         emit: Optional[EventCallback] = None
+                                         ) -> Dict[str, Tuple[str, str]]:
+        """Generate the descriptions and translated transcripts of a transcript.
+
+        The requests follow the plan chosen by the pipeline planner (stored
+        in `self.plan`). Under the direct plan the transcript translations
+        run concurrently with the descriptions; under the master plan they
+        are batched with the translations of the English description.
+
+        Args:
+            transcript: Transcript in its spoken language
+            target_langs: Target language codes
+            report: Progress callback receiving (stage, status) updates
+            on_description: Optional callback receiving the streamed descriptions
+            emit: Optional callback receiving the transcript and description events
+
+        Returns:
+            dict: Target language -> (transcript, description)
+        """
+        emit = emit or (lambda event: None)
+
+        # Pick the cheapest set of requests for the remaining stages
+        detected_lang = self.detect_language(transcript)
+        self.plan = self._plan(transcript, detected_lang, target_langs, self.translate_transcript)
+
+        # Generate the descriptions from the original transcript
+        report("description", "running")
+        if self.plan.direct:
+            descriptions_task = asyncio.ensure_future(
+                self.generate_descriptions_async(transcript, target_langs, direct=True,
+                                                 on_description=on_description)
+            )
+            separate = self.plan.transcript_langs
+        else:
+            descriptions_task = asyncio.ensure_future(
+                self._master_plan_async(transcript, target_langs, on_description)
+            )
+            # Only English has no description translation to share a request with
+            separate = [lang for lang in self.plan.transcript_langs if lang == "en"]
+
+        try:
+            # Translate the remaining transcripts if needed, meanwhile
+            transcripts = {lang: transcript for lang in target_langs}
+            if self.plan.transcript_langs:
+                report("translation", "running")
+            else:
+                report("translation", "skipped")
+            translated = await asyncio.gather(*(
+                self.translate_text_async(transcript, lang) for lang in separate
+            ))
+            transcripts.update(zip(separate, translated))
+
+            if self.plan.direct:
+                descriptions = await descriptions_task
+            else:
+                batched, descriptions = await descriptions_task
+                transcripts.update(batched)
+        except BaseException:
+            # Stop the description requests of a failed (or cancelled) job
+            descriptions_task.cancel()
+            raise
+        if self.plan.transcript_langs:
+            report("translation", "done")
+
+        for lang, text in transcripts.items():
+            self._save_transcripts(text, lang)
+            emit(PipelineEvent("transcript", text, lang))
+        logger.info(f"Saved transcripts to {self.transcripts_dir}")
+
+        for lang, text in descriptions.items():
+            self._save_description(text, lang)
+            emit(PipelineEvent("description", text, lang))
+        logger.info(f"Saved descriptions to {self.description_dir}")
+        report("description", "done")
+
+        return {lang: (transcripts[lang], descriptions[lang]) for lang in target_langs}
+
+    async def _master_plan_async(self, transcript: str, target_langs: List[str],
+                                 on_description: Optional[DescriptionCallback] = None
+                                 ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Write one English description, then translate it into each other
+        target language in one request, together with the transcript where
+        the plan translates it.
+
+        Args:
+            transcript: Transcript in its spoken language
+            target_langs: Target language codes
+            on_description: Optional callback receiving the descriptions; the
+                English one streams in, translated ones arrive whole
+
+        Returns:
+            tuple: (language -> transcript translated along with the
+                description, target language -> description)
+        """
+        # Only stream the English master if it is displayed itself
+        master = (await self.generate_descriptions_async(
+            transcript, ["en"], direct=True,
+            on_description=on_description if "en" in target_langs else None
+        ))["en"]
+
+        with_transcript = set(self.plan.transcript_langs)
+        foreign = [lang for lang in target_langs if lang != "en"]
+
+        async def translate(lang: str) -> Tuple[Optional[str], str]:
+            if lang in with_transcript:
+                text, description = await self.translate_texts_async([transcript, master], lang)
+                return text, description
+            return None, await self.translate_text_async(master, lang)
+
+        translated = await asyncio.gather(*(translate(lang) for lang in foreign))
+        transcripts = {}
+        descriptions = {lang: master for lang in target_langs}
+        for lang, (text, description) in zip(foreign, translated):
+            if text is not None:
+                transcripts[lang] = text
+            descriptions[lang] = description
+            if on_description is not None:
+                on_description(lang, description)
+        return transcripts, descriptions
+
+    def _cache_key(self) -> str:
+        """Build the result cache key for this video. Target languages share
+        one entry, holding the result of each of them.
+
+        Returns:
+            str: Cache key covering every setting that affects the result
+        """
+        if self.video_hash is None:
+            self.video_hash = hash_file(self.video_path)
+        return make_key(
+            self.video_hash,
+            frame_interval=self.frame_interval,
+            frame_strategy=self.frame_strategy,
+            frame_max_dimension=self.frame_max_dimension,
+            frame_quality=self.frame_quality,
+            audio_mode=self.audio_mode,
+            gpt_model=GPT_MODEL,
+            whisper_model=WHISPER_MODEL,
+            description_prompt_version=DESCRIPTION_PROMPT_VERSION,
+            translate_transcript=self.translate_transcript,
+        )
+
+    @staticmethod
+    def _description_cache_key(transcript: str, lang: str) -> str:
+        """Build the description cache key of a transcript.
+
+        Args:
+            transcript: Transcript the description is generated from
+            lang: Language code of the description
+
+        Returns:
+            str: Cache key covering the transcript, language, model and
+                prompt version
+        """
+        return make_text_key(hash_text(transcript), lang=lang, model=GPT_MODEL,
+                             prompt_version=DESCRIPTION_PROMPT_VERSION)
+
+    def _cached_description(self, transcript: str, lang: str) -> Optional[str]:
+        """Return the cached description of a transcript in `lang`, if any."""
+        if self.description_cache is None:
+            return None
+        return self.description_cache.get(self._description_cache_key(transcript, lang))
+
+    def _store_description(self, transcript: str, lang: str, description: str) -> None:
+        """Cache the description generated from a transcript in `lang`."""
+        if self.description_cache is None:
+            return
+        try:
+            self.description_cache.put(self._description_cache_key(transcript, lang), description)
+        except Exception as e:
+            # The description is still returned; only the cache entry is lost
+            logger.warning(f"Failed to cache the {lang} description: {str(e)}")
+
+    def _restore_cached(self, cached: Dict, target_langs: List[str],
+                        report: ProgressCallback, emit: Optional[EventCallback] = None
+                        ) -> Dict[str, Tuple[str, str]]:
+        """Serve a cached result without running any pipeline stage.
+
+        Args:
+            cached: Result returned by ResultCache.get
+            target_langs: Target language codes, all present in the cache entry
+            report: Progress callback receiving (stage, status) updates
+            emit: Optional callback receiving the cached results as events
+
+        Returns:
+            dict: Target language -> (transcript, description) from the cache
+        """
+        self.extracted_frames = cached["frames"]
+        if cached["audio_path"]:
+            self.audio_path = cached["audio_path"]
+        self.transcript = cached["transcript"]
+        results = {lang: cached["results"][lang] for lang in target_langs}
+        for lang, (transcript, description) in results.items():
+            self._save_transcripts(transcript, lang)
+            self._save_description(description, lang)
+        for stage in PIPELINE_STAGES:
+            report(stage, "cached")
+
+        if emit is not None:
+            for frame_filename, timestamp in self.extracted_frames:
+                emit(PipelineEvent("frame", (frame_filename, timestamp)))
+            if cached["audio_path"]:
+                emit(PipelineEvent("audio", self.audio_path))
+            for lang, (transcript, description) in results.items():
+                emit(PipelineEvent("transcript", transcript, lang))
+                emit(PipelineEvent("description", description, lang))
+        return results
+
+    async def _extract_frames_async(self, report: ProgressCallback,
+                                    emit: Optional[EventCallback] = None
+                                    ) -> List[Tuple[str, float]]:
+        """Run the frame pass in the extraction executor, reporting its progress.
+
+        Args:
+            report: Progress callback receiving (stage, status) updates
+            emit: Optional callback receiving a "frame" event per saved frame
+
+        Returns:
+            list: (frame_filename, timestamp) tuples of the saved frames
+        """
+        loop = asyncio.get_running_loop()
+
+        # Frames are announced from the extraction thread as they are written;
+        # a process pool cannot call back, so its frames come at the end
+        on_frame = None
+        if emit is not None and not isinstance(self.executor, ProcessPoolExecutor):
+            def on_frame(frame_filename: str, timestamp: float) -> None:
+                loop.call_soon_threadsafe(
+                    emit, PipelineEvent("frame", (frame_filename, timestamp))
+                )
+
+        report("frames", "running")
+        try:
+            frames = await loop.run_in_executor(
+                self.executor, functools.partial(extract_frames, self.video_path, self.frames_dir,
+                                        frame_interval=self.frame_interval,
+                                        strategy=self.frame_strategy,
+                                        max_dimension=self.frame_max_dimension,
+                                        quality=self.frame_quality,
+                                        workers=self.frame_workers,
+                                        on_frame=on_frame)
+            )
+        except Exception:
+            report("frames", "failed")
+            raise
+        logger.info(f"Extracted frames to {self.frames_dir}")
+        if emit is not None and on_frame is None:
+            for frame_filename, timestamp in frames:
+                emit(PipelineEvent("frame", (frame_filename, timestamp)))
+        report("frames", "done")
+        return frames
+
+    def transcript_path(self, lang: str) -> str:
+        """Return the path of the transcript in the given language."""
+        return os.path.join(self.transcripts_dir, f"transcript_{lang}.txt")
+
+    def description_path(self, lang: str) -> str:
+        """Return the path of the description in the given language."""
+        return os.path.join(self.description_dir, f"description_{lang}.txt")
+
+    def _save_transcripts(self, transcript: str, lang: str) -> None:
         """Save transcription text to file.
         
         Args:
             transcript: The full transcription text
+            lang: Language code of the transcript
         """
-        with open(self.transcripts_path, 'w', encoding="utf-8") as f:
+        with open(self.transcript_path(lang), 'w', encoding="utf-8") as f:
             f.write(transcript)
 
-    def _save_description(self, description: str) -> None:
+    def _save_description(self, description: str, lang: str) -> None:
         """Save generated description to file.
         
         Args:
             description: The generated description text
+            lang: Language code of the description
         """
-        with open(self.description_path, 'w', encoding="utf-8") as f:
+        with open(self.description_path(lang), 'w', encoding="utf-8") as f:
             f.write(description)
 
     def detect_language(self, text: str) -> Optional[str]:
@@ -164,6 +1024,8 @@ class VideoProcessor:
 
     def translate_text(self, text: str, target_lang: str) -> str:
         """Translate text to target language using GPT-4.
+
+        Thin synchronous wrapper around translate_text_async, see process_video.
         
         Args:
             text: Text to translate
@@ -172,38 +1034,170 @@ class VideoProcessor:
         Returns:
             str: Translated text
         """
+        return run_coroutine(self.translate_text_async(text, target_lang))
+
+    async def translate_text_async(self, text: str, target_lang: str) -> str:
+        """Async variant of translate_text, the one making the request.
+
+        Args:
+            text: Text to translate
+            target_lang: Target language code (e.g. 'en', 'de')
+
+        Returns:
+            str: Translated text
+        """
+        return (await self.translate_texts_async([text], target_lang))[0]
+
+    def translate_texts(self, texts: List[str], target_lang: str) -> List[str]:
+        """Thin synchronous wrapper around translate_texts_async, see process_video.
+
+        Args:
+            texts: Texts to translate
+            target_lang: Target language code (e.g. 'en', 'de')
+
+        Returns:
+            list: Translated texts, in input order
+        """
+        return run_coroutine(self.translate_texts_async(texts, target_lang))
+
+    async def translate_texts_async(self, texts: List[str], target_lang: str) -> List[str]:
+        """Translate several texts to the target language in one request.
+
+        The texts are split into sentences; sentences found in the translation
+        memory are reused and all others are sent in a single batched
+        request. If the batched reply cannot be matched to the sentences,
+        each text is translated as a whole instead.
+
+        Args:
+            texts: Texts to translate
+            target_lang: Target language code (e.g. 'en', 'de')
+
+        Returns:
+            list: Translated texts, in input order (the original text where
+                translation failed)
+        """
+        batch = TranslationBatch(texts, target_lang, GPT_MODEL, self.translation_memory)
+        if batch.pending:
+            try:
+                response = await self._get_async_client().chat.completions.create(
+                    **self._batch_translation_request(batch.pending, target_lang)
+                )
+                batch.resolve(response.choices[0].message.content)
+            except Exception as e:
+                logger.error(f"Batched translation failed, translating texts whole: {str(e)}")
+                return list(await asyncio.gather(*(
+                    self._translate_whole_async(text, target_lang) for text in texts
+                )))
+        return batch.texts()
+
+    async def _translate_whole_async(self, text: str, target_lang: str) -> str:
+        """Translate a text in a single request, bypassing the translation memory.
+
+        Args:
+            text: Text to translate
+            target_lang: Target language code (e.g. 'en', 'de')
+
+        Returns:
+            str: Translated text, or the original text if translation failed
+        """
         try:
-            client = OpenAI()
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[{
-                    "role": "system",
-                    "content": f"Translate the following text to {target_lang}. Keep the meaning accurate."
-                }, {
-                    "role": "user",
-                    "content": text
-                }],
-                temperature=0.3
+            response = await self._get_async_client().chat.completions.create(
+                **self._translation_request(text, target_lang)
             )
             return response.choices[0].message.content
         except Exception as e:
             logger.error(f"Translation failed: {str(e)}")
             return text
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Return the injected async client or the shared one of the running loop."""
+        return self.async_client if self.async_client is not None else get_async_client()
+
+    @staticmethod
+    def _description_request(transcript: str, lang: str) -> Dict:
+        """Build the chat completion arguments for describing a transcript in `lang`."""
+        prompt = DESCRIPTION_PROMPT.format(transcript=transcript,
+                                           language=LANGUAGE_NAMES.get(lang, lang))
+        return dict(
+            model=GPT_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7
+        )
+
+    @staticmethod
+    def _facts_request(chunk: str) -> Dict:
+        """Build the chat completion arguments for extracting the key facts
+        of a transcript chunk."""
+        return dict(
+            model=GPT_MODEL,
+            messages=[{"role": "user", "content": FACTS_PROMPT.format(transcript=chunk)}],
+            temperature=0.3
+        )
+
+    @staticmethod
+    def _translation_request(text: str, target_lang: str) -> Dict:
+        """Build the chat completion arguments for translating text."""
+        return dict(
+            model=GPT_MODEL,
+            messages=[{
+                "role": "system",
+                "content": f"Translate the following text to {target_lang}. Keep the meaning accurate."
+            }, {
+                "role": "user",
+                "content": text
+            }],
+            temperature=0.3
+        )
+
+    @staticmethod
+    def _batch_translation_request(segments: List[str], target_lang: str) -> Dict:
+        """Build the chat completion arguments for translating several
+        segments at once, passed and returned as a JSON array."""
+        return dict(
+            model=GPT_MODEL,
+            messages=[{
+                "role": "system",
+                "content": f"Translate each string of the JSON array to {target_lang}. "
+                           "Keep the meaning accurate. Reply with only a JSON array of the "
+                           "translations, in the same order and with the same number of items."
+            }, {
+                "role": "user",
+                "content": json.dumps(segments, ensure_ascii=False)
+            }],
+            temperature=0.3
+        )
+
+
+async def process_videos_async(processors: List[VideoProcessor], target_lang: str,
+                               progress: Optional[ProgressCallback] = None) -> List[Tuple[str, str]]:
+    """Process several videos concurrently on the running event loop.
+
+    Args:
+        processors: One VideoProcessor per video
+        target_lang: Selected target language for all videos
+        progress: Optional callback shared by all processors
+
+    Returns:
+        list: (transcript, description) per processor, in input order
+    """
+    return await asyncio.gather(*(
+        processor.process_video_async(target_lang, progress=progress)
+        for processor in processors
+    ))
+
 class VideoApp:
     """Streamlit application for video processing."""
     
     def __init__(self):
         """Initialize the Streamlit app with supported languages and processing settings."""
         self.video_path = None
+        self.video_hash = None
         self.processor = None
-        self.target_languages = {
-            "English": "en",
-            "German": "de",
-            "French": "fr",
-            "Spanish": "es",
-            "Italian": "it"
-        }
+        self.cache = ResultCache()
+        self.transcript_cache = TextCache(TRANSCRIPT_CACHE_DIR)
+        self.description_cache = TextCache(DESCRIPTION_CACHE_DIR)
+        self.translation_memory = TranslationMemory()
+        self.target_languages = {name: code for code, name in LANGUAGE_NAMES.items()}
         
     def _upload_video(self) -> Optional[str]:
         """Handle video file upload and return temporary file path.
@@ -218,17 +1212,52 @@ class VideoApp:
         )
         
         if uploaded_file is not None:
-            # Create temp directory if it doesn't exist
-            temp_dir = "temp_uploads"
-            os.makedirs(temp_dir, exist_ok=True)
-            
-            # Save uploaded file
-            file_path = os.path.join(temp_dir, uploaded_file.name)
-            with open(file_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            
+            # Reruns of the script see the same upload again; reuse its file
+            uploads = st.session_state.setdefault("uploads", {})
+            saved = uploads.get(uploaded_file.file_id)
+            if saved is None or not os.path.exists(saved[0]):
+                saved = uploads[uploaded_file.file_id] = self._persist_upload(uploaded_file)
+
+            file_path, self.video_hash = saved
             return file_path
         return None
+
+    @staticmethod
+    def _persist_upload(uploaded_file, temp_dir: str = "temp_uploads") -> Tuple[str, str]:
+        """Write an upload to disk under its content hash.
+
+        The upload buffer is hashed and written in fixed-size slices of a
+        memoryview, so no copy of the video is made in memory. The write is
+        skipped when a file with the same hash and size already exists.
+
+        Args:
+            uploaded_file: Streamlit UploadedFile
+            temp_dir: Directory holding the uploaded videos
+
+        Returns:
+            tuple: (file_path, video_hash)
+        """
+        # Create temp directory if it doesn't exist
+        os.makedirs(temp_dir, exist_ok=True)
+
+        buffer = uploaded_file.getbuffer()
+        digest = hashlib.sha256()
+        for offset in range(0, len(buffer), HASH_CHUNK_SIZE):
+            digest.update(buffer[offset:offset + HASH_CHUNK_SIZE])
+        video_hash = digest.hexdigest()
+
+        extension = os.path.splitext(uploaded_file.name)[1].lower()
+        file_path = os.path.join(temp_dir, f"{video_hash}{extension}")
+        if os.path.exists(file_path) and os.path.getsize(file_path) == len(buffer):
+            logger.info(f"Upload {uploaded_file.name} already stored at {file_path}")
+            return file_path, video_hash
+
+        # Sessions are threads of one process; each write gets its own file
+        with tempfile.NamedTemporaryFile(dir=temp_dir, suffix=".part", delete=False) as f:
+            for offset in range(0, len(buffer), HASH_CHUNK_SIZE):
+                f.write(buffer[offset:offset + HASH_CHUNK_SIZE])
+        os.replace(f.name, file_path)
+        return file_path, video_hash
         
     def run(self):
         """Run the Streamlit application."""
@@ -244,46 +1273,126 @@ class VideoApp:
         # Display video
         st.video(self.video_path)
         
-        # Language selection
-        target_lang = st.selectbox(
-            "Select target language for transcription:",
-            options=list(self.target_languages.keys())
+        # Language selection; all selected languages are produced in one run
+        selected = st.multiselect(
+            "Select target languages for transcription:",
+            options=list(self.target_languages.keys()),
+            default=["English"]
         )
         
         # Initialize processor
-        self.processor = VideoProcessor(self.video_path)
+        self.processor = VideoProcessor(self.video_path, cache=self.cache,
+                                        video_hash=self.video_hash,
+                                        output_dir=self._job_dir(self.video_path),
+                                        transcript_cache=self.transcript_cache,
+                                        description_cache=self.description_cache,
+                                        translation_memory=self.translation_memory)
         
-        if st.button("Process Video"):
+        if st.button("Process Video", disabled=not selected):
             try:
-                with st.spinner("Processing video..."):
-                    transcripts, description = self.processor.process_video(target_lang)
-                
-                # Display results
+                progress = self._progress_reporter()
+                langs = [self.target_languages[name] for name in selected]
+
+                # Frames show up while the audio is still being processed
+                st.subheader("Frames")
+                gallery = st.columns(GALLERY_COLUMNS)
+                frame_count = 0
+                audio_slot = st.empty()
+
+                # One tab per language; descriptions render while they stream in
+                slots = {}
+                for tab, lang in zip(st.tabs(selected), langs):
+                    with tab:
+                        slots[lang] = (st.empty(), st.empty())
+
+                for event in self.processor.events(langs):
+                    if event.kind == "progress":
+                        progress(*event.value)
+                    elif event.kind == "frame":
+                        frame_filename, timestamp = event.value
+                        gallery[frame_count % GALLERY_COLUMNS].image(
+                            frame_filename, caption=f"{timestamp:.1f}s"
+                        )
+                        frame_count += 1
+                    elif event.kind == "audio":
+                        audio_slot.audio(event.value)
+                    elif event.kind == "transcript":
+                        self._display_transcription(event.value, slots[event.lang][0])
+                    elif event.kind == "description_partial":
+                        self._display_description(event.value, slots[event.lang][1],
+                                                  streaming=True)
+                    elif event.kind == "description":
+                        self._display_description(event.value, slots[event.lang][1])
+
                 st.success("Processing complete!")
-                self._display_transcription(transcripts)
-                self._display_description(description)
                 
             except Exception as e:
                 st.error(f"An error occurred: {str(e)}")
                 logger.error(f"Application error: {str(e)}")
 
-    def _display_transcription(self, transcript: str) -> None:
+    def _job_dir(self, video_path: str) -> str:
+        """Return the output workspace of this session for the given video.
+
+        Workspaces are unique per session and video, so concurrent users
+        never overwrite each other's outputs.
+
+        Args:
+            video_path: Path of the uploaded video
+
+        Returns:
+            str: Path of the job workspace
+        """
+        job_dirs = st.session_state.setdefault("job_dirs", {})
+        if video_path not in job_dirs:
+            job_dirs[video_path] = create_job_dir()
+        else:
+            # Keep the workspace of an active session away from cleanup
+            touch_job_dir(job_dirs[video_path])
+        return job_dirs[video_path]
+
+    def _progress_reporter(self) -> ProgressCallback:
+        """Create one status line per pipeline stage and return a callback
+        that updates them.
+
+        Returns:
+            callable: Progress callback for VideoProcessor.process_video
+        """
+        icons = {"running": "⏳", "done": "✅", "skipped": "⏭️", "cached": "⚡", "failed": "❌"}
+        placeholders = {stage: st.empty() for stage in PIPELINE_STAGES}
+
+        def report(stage: str, status: str) -> None:
+            placeholders[stage].write(f"{icons[status]} {PIPELINE_STAGES[stage]}")
+
+        for stage in PIPELINE_STAGES:
+            placeholders[stage].write(f"▫️ {PIPELINE_STAGES[stage]}")
+        return report
+
+    def _display_transcription(self, transcript: str, placeholder=None) -> None:
         """Display transcription text.
         
         Args:
             transcript: The full transcription text
+            placeholder: Optional st.empty() slot to render into
         """
-        st.subheader("Transcription")
-        st.write(transcript)
+        container = placeholder.container() if placeholder is not None else st.container()
+        container.subheader("Transcription")
+        container.write(transcript)
 
-    def _display_description(self, description: str) -> None:
+    def _display_description(self, description: str, placeholder=None,
+                             streaming: bool = False) -> None:
         """Display generated description.
+
+        Called repeatedly with the same placeholder while the description
+        streams in, each call replacing the previous text.
         
         Args:
-            description: The generated description text
+            description: The generated description text (so far)
+            placeholder: Optional st.empty() slot to render into
+            streaming: Whether more text is still to come
         """
-        st.subheader("Generated Description")
-        st.write(description)
+        container = placeholder.container() if placeholder is not None else st.container()
+        container.subheader("Generated Description")
+        container.write(description + (" ▌" if streaming else ""))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,293 @@
+import asyncio
+import concurrent.futures
+import logging
+import os
+import queue
+import threading
+import weakref
+from typing import AsyncIterator, Awaitable, Dict, Iterator, Optional, TypeVar
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+logger = logging.getLogger(__name__)
+
+# Connection pool and timeout settings of the shared client
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 60.0
+CONNECT_TIMEOUT = 10.0
+REQUEST_TIMEOUT = 300.0
+
+
+class ConnectionMetrics:
+    """Thread-safe counters of HTTP requests and the TCP connections they
+    opened, used to check that the pool actually reuses connections."""
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    @property
+    def reused(self) -> int:
+        """Number of requests served over an already open connection."""
+        return self.requests - self.connections
+
+    def on_request(self, request: httpx.Request) -> None:
+        """httpx request hook: count the request and trace its connection setup.
+
+        Args:
+            request: The outgoing request
+        """
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def on_request_async(self, request: httpx.Request) -> None:
+        """httpx.AsyncClient request hook, see on_request.
+
+        Args:
+            request: The outgoing request
+        """
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace_async
+
+    def _trace(self, event_name: str, info: Dict) -> None:
+        """httpcore trace callback counting newly opened connections."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections += 1
+
+    async def _trace_async(self, event_name: str, info: Dict) -> None:
+        """Async httpcore trace callback, see _trace."""
+        self._trace(event_name, info)
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return {"requests": self.requests, "connections": self.connections,
+                    "reused": self.requests - self.connections}
+
+    def __str__(self) -> str:
+        counts = self.as_dict()
+        return (f"{counts['requests']} requests over {counts['connections']} connections "
+                f"({counts['reused']} reused)")
+
+
+metrics = ConnectionMetrics()
+
+T = TypeVar("T")
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
+# Async clients hold connections bound to their event loop, so one is kept per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = \
+    weakref.WeakKeyDictionary()
+
+# Event loop running the async work of sync callers, kept for the process
+# lifetime so its async client and connection pool are reused across calls
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _api_key(api_key: Optional[str]) -> str:
+    """Return the given API key or the one from OPENAI_API_KEY."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("API key is missing. Set OPENAI_API_KEY as an environment variable.")
+    return api_key
+
+
+def _pool_settings(max_connections: int, max_keepalive_connections: int,
+                   keepalive_expiry: float, connect_timeout: float,
+                   request_timeout: float) -> Dict:
+    """Build the httpx client keyword arguments shared by sync and async clients."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(request_timeout, connect=connect_timeout),
+    }
+
+
+def create_client(api_key: Optional[str] = None,
+                  max_connections: int = MAX_CONNECTIONS,
+                  max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+                  keepalive_expiry: float = KEEPALIVE_EXPIRY,
+                  connect_timeout: float = CONNECT_TIMEOUT,
+                  request_timeout: float = REQUEST_TIMEOUT) -> OpenAI:
+    """Create an OpenAI client backed by a keep-alive connection pool.
+
+    Args:
+        api_key: OpenAI API key, read from OPENAI_API_KEY if omitted
+        max_connections: Upper bound of concurrent connections
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept open
+        connect_timeout: Seconds allowed to establish a connection
+        request_timeout: Seconds allowed for reading/writing a request
+
+    Returns:
+        OpenAI: Client recording its connection usage in `metrics`
+    """
+    http_client = httpx.Client(
+        **_pool_settings(max_connections, max_keepalive_connections, keepalive_expiry,
+                         connect_timeout, request_timeout),
+        event_hooks={"request": [metrics.on_request]},
+    )
+    return OpenAI(api_key=_api_key(api_key), http_client=http_client)
+
+
+def create_async_client(api_key: Optional[str] = None,
+                        max_connections: int = MAX_CONNECTIONS,
+                        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+                        connect_timeout: float = CONNECT_TIMEOUT,
+                        request_timeout: float = REQUEST_TIMEOUT) -> AsyncOpenAI:
+    """Create an AsyncOpenAI client backed by a keep-alive connection pool.
+
+    Takes the same arguments as create_client.
+
+    Returns:
+        AsyncOpenAI: Client recording its connection usage in `metrics`
+    """
+    http_client = httpx.AsyncClient(
+        **_pool_settings(max_connections, max_keepalive_connections, keepalive_expiry,
+                         connect_timeout, request_timeout),
+        event_hooks={"request": [metrics.on_request_async]},
+    )
+    return AsyncOpenAI(api_key=_api_key(api_key), http_client=http_client)
+
+
+def get_client() -> OpenAI:
+    """Return the process-wide shared client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = create_client()
+            logger.info("Created shared OpenAI client")
+        return _client
+
+
+def get_async_client() -> AsyncOpenAI:
+    """Return the shared async client of the running event loop, creating it
+    on first use. Must be called from a coroutine."""
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = create_async_client()
+            logger.info("Created shared AsyncOpenAI client")
+        return client
+
+
+async def close_async_client() -> None:
+    """Close the shared async client of the running event loop, if any.
+
+    Call it before a short-lived event loop (e.g. one from asyncio.run)
+    ends, so its connection pool is released instead of leaked.
+    """
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it on first use."""
+    global _loop
+    with _client_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="openai-event-loop",
+                             daemon=True).start()
+        return _loop
+
+
+def submit_coroutine(coro: Awaitable[T]) -> "concurrent.futures.Future[T]":
+    """Schedule a coroutine on the shared background event loop.
+
+    Unlike asyncio.run, every call runs on the same loop, so the async
+    client of that loop and its open connections are reused.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        concurrent.futures.Future: Future of the coroutine result
+    """
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Cannot wait for the background event loop from its own thread")
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
+
+def run_coroutine(coro: Awaitable[T]) -> T:
+    """Run a coroutine on the shared background event loop and wait for it.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine result; its exceptions are raised here
+    """
+    return submit_coroutine(coro).result()
+
+
+def iterate_async(iterator: AsyncIterator[T]) -> Iterator[T]:
+    """Consume an async iterator on the shared background event loop.
+
+    Closing the returned generator before the end cancels the iteration.
+
+    Args:
+        iterator: Async iterator (e.g. an async generator) to consume
+
+    Yields:
+        Its items, as soon as they are produced; its exceptions are raised here
+    """
+    items = queue.Queue()
+    done = object()
+
+    async def pump() -> None:
+        try:
+            async for item in iterator:
+                items.put(item)
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    future = submit_coroutine(pump())
+    future.add_done_callback(lambda _: items.put(done))
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                break
+            yield item
+        future.result()
+    finally:
+        # The consumer stopped early (e.g. closed the generator): stop the
+        # producer too instead of letting it run on in the background
+        future.cancel()
+
+
+def set_client(client: OpenAI) -> None:
+    """Replace the process-wide shared client, e.g. with custom pool settings.
+
+    Args:
+        client: Client returned by create_client (or any OpenAI client)
+    """
+    global _client
+    with _client_lock:
+        _client = client
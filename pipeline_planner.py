@@ -0,0 +1,173 @@
+import logging
+from typing import Dict, List, Optional
+
+from token_counter import count_tokens, split_by_tokens
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a generated bullet-point description, used for cost estimates
+DESCRIPTION_OUTPUT_TOKENS = 150
+
+# Rough size of the key facts extracted from one chunk of a long transcript
+FACTS_OUTPUT_TOKENS = 150
+
+# Instruction tokens added to every translation request
+TRANSLATION_PROMPT_TOKENS = 40
+
+# Description plans:
+#   "master" - one English description, translated into every other language
+#              in the same request as the transcript when both are needed
+#   "direct" - one prompt per language writing the description in that language
+PLAN_NAMES = ("master", "direct")
+
+
+class ApiCall:
+    """One chat completion request of a plan, with its estimated token usage."""
+
+    def __init__(self, purpose: str, lang: str, input_tokens: int, output_tokens: int):
+        """Describe a request made for `purpose` ("fact_extraction",
+        "description", "description_translation", "transcript_translation"
+        or "batch_translation" of the transcript and description together)
+        in `lang`."""
+        self.purpose = purpose
+        self.lang = lang
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+
+    def __repr__(self) -> str:
+        return (f"ApiCall({self.purpose!r}, {self.lang!r}, "
+                f"{self.input_tokens}+{self.output_tokens} tokens)")
+
+
+class PipelinePlan:
+    """The chat completion requests needed after transcription to produce the
+    transcripts and descriptions of a set of target languages."""
+
+    def __init__(self, name: str, calls: List[ApiCall], transcript_langs: List[str]):
+        """Initialize a plan.
+
+        Args:
+            name: One of PLAN_NAMES
+            calls: Requests the plan makes
+            transcript_langs: Languages the transcript gets translated into
+        """
+        self.name = name
+        self.calls = calls
+        self.transcript_langs = transcript_langs
+
+    @property
+    def direct(self) -> bool:
+        """Whether descriptions are written directly in each target language."""
+        return self.name == "direct"
+
+    @property
+    def api_calls(self) -> int:
+        """Number of chat completion requests."""
+        return len(self.calls)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated total of input and output tokens."""
+        return sum(call.input_tokens + call.output_tokens for call in self.calls)
+
+    def as_dict(self) -> Dict:
+        """Return a JSON-serializable summary of the plan."""
+        return {"name": self.name, "api_calls": self.api_calls, "tokens": self.tokens,
+                "transcript_langs": self.transcript_langs}
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.api_calls} API calls, ~{self.tokens} tokens"
+
+
+def candidate_plans(transcript: str, source_lang: Optional[str], target_langs: List[str],
+                    translate_transcript: bool = True, description_prompt_tokens: int = 0,
+                    max_transcript_tokens: Optional[int] = None, chunk_tokens: int = 0,
+                    facts_prompt_tokens: int = 0) -> List[PipelinePlan]:
+    """Build every plan able to produce the requested outputs.
+
+    Args:
+        transcript: Transcript the descriptions are generated from
+        source_lang: Detected language of the transcript, None if unknown
+        target_langs: Target language codes
+        translate_transcript: Whether the transcript is needed in each
+            target language (e.g. to display it), or only the descriptions
+        description_prompt_tokens: Tokens of the description prompt template
+        max_transcript_tokens: Transcripts above this many tokens are first
+            condensed into key facts, `chunk_tokens` at a time; None never
+            condenses
+        chunk_tokens: Token budget of a transcript chunk
+        facts_prompt_tokens: Tokens of the fact extraction prompt template
+
+    Returns:
+        list: One PipelinePlan per entry of PLAN_NAMES
+    """
+    transcript_tokens = count_tokens(transcript)
+
+    # Long transcripts are condensed once, shared by every description request
+    condense_calls = []
+    source_tokens = transcript_tokens
+    if max_transcript_tokens is not None and transcript_tokens > max_transcript_tokens:
+        condense_calls = [
+            ApiCall("fact_extraction", "en", facts_prompt_tokens + count_tokens(chunk),
+                    FACTS_OUTPUT_TOKENS)
+            for chunk in split_by_tokens(transcript, chunk_tokens)
+        ]
+        source_tokens = len(condense_calls) * FACTS_OUTPUT_TOKENS
+    describe_tokens = description_prompt_tokens + source_tokens
+
+    transcript_langs = []
+    if translate_transcript and source_lang:
+        transcript_langs = [lang for lang in target_langs if lang != source_lang]
+    transcript_calls = [
+        ApiCall("transcript_translation", lang,
+                TRANSLATION_PROMPT_TOKENS + transcript_tokens, transcript_tokens)
+        for lang in transcript_langs
+    ]
+
+    master = condense_calls + [ApiCall("description", "en", describe_tokens,
+                                       DESCRIPTION_OUTPUT_TOKENS)]
+    for lang in target_langs:
+        if lang == "en":
+            continue
+        if lang in transcript_langs:
+            # Transcript and description share one batched translation request
+            master.append(ApiCall("batch_translation", lang,
+                                  TRANSLATION_PROMPT_TOKENS + transcript_tokens
+                                  + DESCRIPTION_OUTPUT_TOKENS,
+                                  transcript_tokens + DESCRIPTION_OUTPUT_TOKENS))
+        else:
+            master.append(ApiCall("description_translation", lang,
+                                  TRANSLATION_PROMPT_TOKENS + DESCRIPTION_OUTPUT_TOKENS,
+                                  DESCRIPTION_OUTPUT_TOKENS))
+    master += [call for call in transcript_calls if call.lang == "en"]
+    direct = condense_calls + [ApiCall("description", lang, describe_tokens,
+                                       DESCRIPTION_OUTPUT_TOKENS)
+                               for lang in target_langs]
+
+    return [PipelinePlan("master", master, transcript_langs),
+            PipelinePlan("direct", direct + transcript_calls, transcript_langs)]
+
+
+def plan_pipeline(transcript: str, source_lang: Optional[str], target_langs: List[str],
+                  translate_transcript: bool = True, description_prompt_tokens: int = 0,
+                  max_transcript_tokens: Optional[int] = None, chunk_tokens: int = 0,
+                  facts_prompt_tokens: int = 0) -> PipelinePlan:
+    """Pick the plan with the fewest API calls, then the fewest tokens.
+
+    A single non-English language is served by one direct prompt instead of
+    describe-then-translate; several languages share one English master when
+    re-sending the transcript per language would cost more tokens, or when
+    batching each transcript translation with the description translation
+    saves requests. Cache and
+    translation memory hits are not taken into account, so the counts are
+    upper bounds. Takes the same arguments as candidate_plans.
+
+    Returns:
+        PipelinePlan: The chosen plan
+    """
+    plans = candidate_plans(transcript, source_lang, target_langs, translate_transcript,
+                            description_prompt_tokens, max_transcript_tokens, chunk_tokens,
+                            facts_prompt_tokens)
+    for plan in plans:
+        logger.info(f"Candidate plan {plan}")
+    return min(plans, key=lambda plan: (plan.api_calls, plan.tokens))
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "outputs/cache"
+TRANSCRIPT_CACHE_DIR = os.path.join(CACHE_DIR, "transcripts")
+DESCRIPTION_CACHE_DIR = os.path.join(CACHE_DIR, "descriptions")
+MANIFEST_NAME = "manifest.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Compute the SHA-256 of a file without loading it into memory.
+
+    Args:
+        path: File to hash
+        chunk_size: Number of bytes read per iteration
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_key(video_hash: str, **params) -> str:
+    """Build a cache key from the video hash and the pipeline parameters.
+
+    Args:
+        video_hash: Content hash of the source video
+        **params: Settings that influence the result (frame interval,
+            target language, model names, ...)
+
+    Returns:
+        str: Hex digest identifying the cache entry
+    """
+    payload = json.dumps({"video": video_hash, **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def make_text_key(content_hash: str, **params) -> str:
+    """Build a TextCache key from the hash of the input content and the
+    parameters of the API call producing the text.
+
+    Args:
+        content_hash: Hash of the input (audio file, transcript, ...)
+        **params: Model, language, prompt or prompt version, ...
+
+    Returns:
+        str: Hex digest identifying the cache entry
+    """
+    payload = json.dumps({"content": content_hash, **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TextCache:
+    """On-disk cache of API call results (transcripts, descriptions), one
+    small JSON file per key, evicted least-recently-used beyond `max_entries`."""
+
+    def __init__(self, cache_dir: str, max_entries: int = 10000):
+        """Initialize the cache rooted at `cache_dir`."""
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached text.
+
+        Args:
+            key: Cache key from make_text_key
+
+        Returns:
+            str: The cached text, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = json.load(f)["text"]
+        except (OSError, ValueError, KeyError):
+            return None
+        os.utime(path)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        """Store a text, evicting the least recently used entries if needed.
+
+        Args:
+            key: Cache key from make_text_key
+            text: Text to store
+        """
+        path = self._path(key)
+        # Unique per writer, so concurrent puts of one key never share it
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.cache_dir,
+                                         suffix=".tmp", delete=False) as f:
+            json.dump({"text": text}, f, ensure_ascii=False)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.remove(f.name)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least-recently-used entries beyond max_entries."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                # Removed by a concurrent eviction
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class ResultCache:
+    """On-disk cache of pipeline results (frames, audio, and the transcript
+    and description of every target language processed), keyed by content
+    hash and evicted least-recently-used once the total size exceeds
+    `max_bytes`."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = 2 * 1024 ** 3):
+        """Initialize the cache rooted at `cache_dir`."""
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up a cached result.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            dict: Cached result with "frames", "audio_path", "transcript"
+                (in its spoken language, None for older entries) and
+                "results" mapping each cached target language to its
+                (transcript, description), or None on a miss
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        manifest_path = os.path.join(entry_dir, MANIFEST_NAME)
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if "results" not in manifest:
+            # Entry written by an older version
+            return None
+
+        # Refresh the recency used for LRU eviction
+        os.utime(manifest_path)
+        return {
+            "frames": [(os.path.join(entry_dir, name), timestamp)
+                       for name, timestamp in manifest["frames"]],
+            "audio_path": (os.path.join(entry_dir, manifest["audio"])
+                           if manifest["audio"] else None),
+            "transcript": manifest.get("transcript"),
+            "results": {lang: tuple(result) for lang, result in manifest["results"].items()},
+        }
+
+    def put(self, key: str, frames: List[Tuple[str, float]], audio_path: Optional[str],
+            results: Dict[str, Tuple[str, str]], transcript: Optional[str] = None) -> None:
+        """Store a pipeline result, copying its frames and audio into the cache.
+
+        Languages already cached under the key are kept alongside the new ones.
+
+        Args:
+            key: Cache key from make_key
+            frames: (frame_filename, timestamp) tuples of the extracted frames
+            audio_path: Path of the extracted audio, if any
+            results: Target language -> (transcript, description)
+            transcript: Transcript in its spoken language, reused to produce
+                further languages from the entry
+        """
+        cached = self.get(key)
+        if cached is not None:
+            results = {**cached["results"], **results}
+            if transcript is None:
+                transcript = cached["transcript"]
+
+        entry_dir = os.path.join(self.cache_dir, key)
+        # Unique per writer, so concurrent puts of one key never share it
+        tmp_dir = tempfile.mkdtemp(prefix=f"{key}.", suffix=".tmp", dir=self.cache_dir)
+        try:
+            self._write_entry(tmp_dir, frames, audio_path, results, transcript)
+
+            # Swap the complete entry in so readers never see a partial one
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            try:
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                # Another writer stored the key in between; keep its entry
+                logger.info(f"Cache entry {key} was written concurrently, keeping the other one")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self._evict()
+
+    @staticmethod
+    def _write_entry(tmp_dir: str, frames: List[Tuple[str, float]], audio_path: Optional[str],
+                     results: Dict[str, Tuple[str, str]], transcript: Optional[str]) -> None:
+        """Copy the frames and audio and write the manifest of an entry into `tmp_dir`."""
+        os.makedirs(os.path.join(tmp_dir, "frames"))
+
+        frame_entries = []
+        for frame_path, timestamp in frames:
+            name = os.path.join("frames", os.path.basename(frame_path))
+            shutil.copyfile(frame_path, os.path.join(tmp_dir, name))
+            frame_entries.append((name, timestamp))
+
+        audio_name = None
+        if audio_path and os.path.exists(audio_path):
+            audio_name = "audio" + os.path.splitext(audio_path)[1]
+            shutil.copyfile(audio_path, os.path.join(tmp_dir, audio_name))
+
+        with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump({
+                "frames": frame_entries,
+                "audio": audio_name,
+                "transcript": transcript,
+                "results": results,
+            }, f)
+
+    def _evict(self) -> None:
+        """Remove least-recently-used entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".tmp"):
+                # Entry still being written
+                continue
+            manifest_path = os.path.join(self.cache_dir, name, MANIFEST_NAME)
+            try:
+                mtime = os.path.getmtime(manifest_path)
+            except OSError:
+                # Not an entry, or replaced by a concurrent put
+                continue
+            size = _dir_size(os.path.join(self.cache_dir, name))
+            entries.append((mtime, size, name))
+            total += size
+
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted cache entry {name}")
+
+
+def _dir_size(path: str) -> int:
+    """Return the total size in bytes of the files below `path`."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
@@ -0,0 +1,34 @@
+import pytest
+
+from extract_frames import _segment_ranges
+
+
+def sampled(ranges, total_frames, frame_interval):
+    """Frame indices the segments sample, stepping from each segment start."""
+    frames = []
+    for start, end in ranges:
+        frames.extend(range(start, total_frames if end is None else end, frame_interval))
+    return frames
+
+
+def test_segments_split_the_video_evenly():
+    assert _segment_ranges(1000, 60, 4) == [(0, 300), (300, 600), (600, 900), (900, None)]
+
+
+def test_short_video_gets_fewer_segments():
+    assert _segment_ranges(100, 60, 4) == [(0, 60), (60, None)]
+    assert _segment_ranges(10, 60, 4) == [(0, None)]
+
+
+@pytest.mark.parametrize("total_frames, frame_interval, segments", [
+    (1000, 60, 4), (1000, 1, 3), (121, 60, 8), (7919, 25, 6), (59, 60, 2),
+])
+def test_segments_sample_the_sequential_frames(total_frames, frame_interval, segments):
+    ranges = _segment_ranges(total_frames, frame_interval, segments)
+    assert len(ranges) <= segments
+    assert all(start % frame_interval == 0 for start, _ in ranges)
+    assert ranges[-1][1] is None
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+    assert sampled(ranges, total_frames, frame_interval) == \
+        list(range(0, total_frames, frame_interval))
@@ -0,0 +1,92 @@
+import pytest
+
+import token_counter
+from pipeline_planner import FACTS_OUTPUT_TOKENS, candidate_plans, plan_pipeline
+
+SHORT = "A red bike. " * 3
+LONG = "A red bicycle in very good condition, barely used. " * 400
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # Use the 4 characters per token estimate, independent of tiktoken
+    monkeypatch.setattr(token_counter, "_encoding", lambda model: None)
+
+
+def purposes(plan):
+    return [(call.purpose, call.lang) for call in plan.calls]
+
+
+def test_single_foreign_language_is_described_directly():
+    plan = plan_pipeline(SHORT, "en", ["de"])
+    assert plan.name == "direct"
+    assert purposes(plan) == [("description", "de"), ("transcript_translation", "de")]
+
+
+def test_source_language_needs_no_transcript_translation():
+    plan = plan_pipeline(SHORT, "en", ["en"])
+    assert plan.api_calls == 1
+    assert plan.transcript_langs == []
+
+
+def test_several_languages_with_short_transcript_are_described_directly():
+    plan = plan_pipeline(SHORT, "en", ["en", "de", "fr"], translate_transcript=False)
+    assert plan.name == "direct"
+    assert plan.api_calls == 3
+
+
+def test_several_languages_with_long_transcript_share_an_english_master():
+    plan = plan_pipeline(LONG, "en", ["en", "de", "fr"], translate_transcript=False)
+    assert plan.name == "master"
+    assert purposes(plan) == [("description", "en"), ("description_translation", "de"),
+                              ("description_translation", "fr")]
+
+
+def test_transcript_translation_is_batched_with_the_description():
+    plan = plan_pipeline(SHORT, "en", ["en", "de", "fr"])
+    assert plan.name == "master"
+    assert purposes(plan) == [("description", "en"), ("batch_translation", "de"),
+                              ("batch_translation", "fr")]
+    assert plan.transcript_langs == ["de", "fr"]
+
+
+def test_english_transcript_translation_stays_separate():
+    master, _ = candidate_plans(SHORT, "de", ["en", "de"])
+    assert purposes(master) == [("description", "en"), ("description_translation", "de"),
+                                ("transcript_translation", "en")]
+
+
+def test_plan_minimizes_calls_before_tokens():
+    master, direct = candidate_plans(LONG, "en", ["de", "fr"], translate_transcript=False)
+    assert master.tokens < direct.tokens
+    assert plan_pipeline(LONG, "en", ["de", "fr"], translate_transcript=False).name == "direct"
+
+
+@pytest.mark.parametrize("source_lang, translate_transcript", [(None, True), ("en", False)])
+def test_transcript_translations_are_skipped(source_lang, translate_transcript):
+    plan = plan_pipeline(SHORT, source_lang, ["de", "fr"], translate_transcript)
+    assert plan.transcript_langs == []
+    assert all(call.purpose != "transcript_translation" for call in plan.calls)
+
+
+def test_long_transcript_is_condensed_once_for_every_plan():
+    plans = candidate_plans(LONG, "en", ["en", "de"], translate_transcript=False,
+                            max_transcript_tokens=1000, chunk_tokens=500)
+    chunks = len(token_counter.split_by_tokens(LONG, 500))
+    assert chunks > 1
+    for plan in plans:
+        facts = [call for call in plan.calls if call.purpose == "fact_extraction"]
+        assert len(facts) == chunks
+        descriptions = [call for call in plan.calls if call.purpose == "description"]
+        assert all(call.input_tokens == chunks * FACTS_OUTPUT_TOKENS for call in descriptions)
+
+
+def test_short_transcript_is_not_condensed():
+    plan = plan_pipeline(SHORT, "en", ["en"], max_transcript_tokens=1000, chunk_tokens=500)
+    assert all(call.purpose != "fact_extraction" for call in plan.calls)
+
+
+def test_as_dict_summarizes_the_plan():
+    plan = plan_pipeline(SHORT, "en", ["de"])
+    assert plan.as_dict() == {"name": "direct", "api_calls": 2, "tokens": plan.tokens,
+                              "transcript_langs": ["de"]}
@@ -0,0 +1,13 @@
+from text_segments import split_segments
+
+
+def test_split_segments_round_trips():
+    text = "First sentence. Second one!  Third?\n- bullet one\n\n- bullet two"
+    parts = split_segments(text)
+    assert "".join(parts) == text
+    assert parts[::2] == ["First sentence.", "Second one!", "Third?", "- bullet one",
+                          "- bullet two"]
+
+
+def test_split_segments_without_separator():
+    assert split_segments("no sentence end here") == ["no sentence end here"]
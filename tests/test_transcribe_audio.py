@@ -0,0 +1,36 @@
+from transcribe_audio import plan_chunks
+
+
+def assert_covers(chunks, duration, max_seconds):
+    assert chunks[0][0] == 0.0
+    assert chunks[-1][1] == duration
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start
+    assert all(0 < end - start <= max_seconds for start, end in chunks)
+
+
+def test_short_audio_is_one_chunk():
+    assert plan_chunks(50.0, [(10.0, 11.0)], max_seconds=60, min_seconds=30) == [(0.0, 50.0)]
+
+
+def test_without_silences_cuts_at_max_length():
+    chunks = plan_chunks(150.0, [], max_seconds=60, min_seconds=30)
+    assert chunks == [(0.0, 60.0), (60.0, 120.0), (120.0, 150.0)]
+
+
+def test_cuts_in_the_middle_of_the_last_usable_silence():
+    silences = [(35.0, 37.0), (50.0, 52.0), (70.0, 80.0)]
+    chunks = plan_chunks(100.0, silences, max_seconds=60, min_seconds=30)
+    # 51 is the last silence midpoint within [30, 60]; 75 lies beyond the first 60s
+    assert chunks == [(0.0, 51.0), (51.0, 100.0)]
+
+
+def test_ignores_silences_before_the_minimum_length():
+    chunks = plan_chunks(100.0, [(5.0, 7.0)], max_seconds=60, min_seconds=30)
+    assert chunks == [(0.0, 60.0), (60.0, 100.0)]
+
+
+def test_chunks_cover_long_audio_contiguously():
+    silences = [(t, t + 0.5) for t in range(7, 3600, 45)]
+    chunks = plan_chunks(3600.0, silences, max_seconds=600, min_seconds=300)
+    assert_covers(chunks, 3600.0, 600)
@@ -0,0 +1,87 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+import translation_memory
+from translation_memory import TranslationBatch, TranslationMemory
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "translations.sqlite3"))
+    yield memory
+    memory.close()
+
+
+def test_batch_deduplicates_and_skips_known_segments(memory):
+    memory.put_many({"Hello.": "Hallo."}, "de", "gpt-4")
+    batch = TranslationBatch(["Hello. Bye.", "Bye. Thanks."], "de", "gpt-4", memory)
+    assert batch.pending == ["Bye.", "Thanks."]
+
+
+def test_batch_resolve_reassembles_texts(memory):
+    batch = TranslationBatch(["Hello. Bye.", "- one\n- two"], "de", "gpt-4", memory)
+    batch.resolve('Here you go: ["Hallo.", "Tschüss.", "- eins", "- zwei"]')
+    assert batch.pending == []
+    assert batch.texts() == ["Hallo. Tschüss.", "- eins\n- zwei"]
+    assert memory.get_many(["Bye.", "- two"], "de", "gpt-4") == {"Bye.": "Tschüss.",
+                                                                 "- two": "- zwei"}
+
+
+def test_batch_resolve_rejects_length_mismatch(memory):
+    batch = TranslationBatch(["Hello. Bye."], "de", "gpt-4", memory)
+    with pytest.raises(ValueError):
+        batch.resolve('["Hallo."]')
+    with pytest.raises(ValueError):
+        batch.resolve("Sorry, I cannot help with that.")
+    assert batch.pending == ["Hello.", "Bye."]
+    assert memory.get_many(["Hello."], "de", "gpt-4") == {}
+
+
+def test_memory_is_scoped_by_language_and_model(memory):
+    memory.put_many({"Hello.": "Hallo."}, "de", "gpt-4")
+    assert memory.get_many(["Hello."], "fr", "gpt-4") == {}
+    assert memory.get_many(["Hello."], "de", "gpt-3.5-turbo") == {}
+
+
+def test_memory_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(translation_memory.time, "time", lambda: next(clock))
+    memory = TranslationMemory(str(tmp_path / "translations.sqlite3"), max_entries=2)
+    try:
+        memory.put_many({"a": "A"}, "de", "gpt-4")
+        memory.put_many({"b": "B"}, "de", "gpt-4")
+        memory.get_many(["a"], "de", "gpt-4")
+        memory.put_many({"c": "C"}, "de", "gpt-4")
+        assert memory.get_many(["a", "b", "c"], "de", "gpt-4") == {"a": "A", "c": "C"}
+    finally:
+        memory.close()
+
+
+def _fake_client(replies):
+    """Async client whose chat completions return `replies` in order."""
+    requests = []
+
+    async def create(**kwargs):
+        requests.append(kwargs)
+        content = replies.pop(0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client, requests
+
+
+def test_translate_texts_falls_back_to_whole_texts(tmp_path, memory):
+    main = pytest.importorskip("main")
+    client, requests = _fake_client(['["only one"]', "Hallo. Tschüss.", "Danke."])
+    processor = main.VideoProcessor("video.mp4", output_dir=str(tmp_path / "job"),
+                                    async_client=client, translation_memory=memory)
+
+    translated = asyncio.run(processor.translate_texts_async(["Hello. Bye.", "Thanks."], "de"))
+
+    assert translated == ["Hallo. Tschüss.", "Danke."]
+    assert len(requests) == 3
+    # Whole-text fallbacks do not feed the sentence memory
+    assert memory.get_many(["Hello.", "Bye.", "Thanks."], "de", main.GPT_MODEL) == {}
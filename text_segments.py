@@ -0,0 +1,19 @@
+import re
+from typing import List
+
+# Sentences end at ., ! or ? followed by whitespace; lines (bullet points) are
+# segments of their own. The separators are kept so texts reassemble exactly.
+_SEGMENT_SEPARATOR = re.compile(r"(\n+|(?<=[.!?])\s+)")
+
+
+def split_segments(text: str) -> List[str]:
+    """Split a text into sentences and lines.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        list: Alternating segments (even indices) and the separators between
+            them (odd indices); joining the list gives back the text
+    """
+    return _SEGMENT_SEPARATOR.split(text)
@@ -0,0 +1,86 @@
+import functools
+import logging
+from typing import List
+
+from text_segments import split_segments
+
+try:
+    import tiktoken
+except ImportError:  # counts fall back to an estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-4"
+FALLBACK_ENCODING = "cl100k_base"
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding(model: str):
+    """Return the tiktoken encoding of a model, or None if unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        # tiktoken downloads its vocabularies on first use
+        logger.warning(f"Token encoding unavailable, estimating token counts: {str(e)}")
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Count the tokens of a text for the given model.
+
+    Uses tiktoken when installed, otherwise estimates about 4 characters
+    per token.
+
+    Args:
+        text: Text to measure
+        model: Model whose tokenizer applies
+
+    Returns:
+        int: Token count
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return -(-len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def split_by_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> List[str]:
+    """Split a text into chunks of at most `max_tokens`, cutting between
+    sentences (or between words for sentences longer than a chunk).
+
+    Args:
+        text: Text to split
+        max_tokens: Token budget of a chunk
+        model: Model whose tokenizer applies
+
+    Returns:
+        list: Chunks in text order
+    """
+    pieces = []
+    for segment in split_segments(text)[::2]:
+        if count_tokens(segment, model) <= max_tokens:
+            pieces.append(segment)
+        else:
+            pieces.extend(segment.split())
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        tokens = count_tokens(piece, model) + 1
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
@@ -1,37 +1,253 @@
-import openai
+import asyncio
 import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from moviepy.config import FFMPEG_BINARY
+from extract_audio import SPEECH_BITRATE, SPEECH_SAMPLE_RATE, probe_duration
+from openai_client import get_async_client, get_client
+from result_cache import hash_file, make_text_key
 
-# Load API key from environment variable
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
-    raise ValueError("API key is missing. Set OPENAI_API_KEY as an environment variable.")
+WHISPER_MODEL = "whisper-1"
+WHISPER_LANGUAGE = "en"
+WHISPER_PROMPT = "Please describe this product in detail including: 1. Product name and type 2. Brand or manufacturer 3. Key features and specifications 4. Condition 5. Age or usage period 6. Included accessories 7. Reason for selling 8. Price expectation. Format the description in complete sentences suitable for an online marketplace listing."
 
-client = openai.OpenAI(api_key=api_key)
+# Audio longer or larger than this is split into chunks transcribed in parallel.
+# Chunks are re-encoded as speech Opus, so their size stays far below the
+# 25 MB upload limit regardless of the source bitrate.
+MAX_UPLOAD_BYTES = 24 * 1024 * 1024
+CHUNK_MAX_SECONDS = 600
+CHUNK_MIN_SECONDS = 300
+CHUNK_WORKERS = 4
 
-def transcribe(audio_path):
-    """ Transcribe the audio file using OpenAI Whisper API """
+# silencedetect settings used to find cut points between chunks
+SILENCE_NOISE = "-35dB"
+SILENCE_MIN_SECONDS = 0.5
+
+
+def _request_params(audio_file, response_format):
+    return dict(
+        model=WHISPER_MODEL,
+        file=audio_file,
+        response_format=response_format,
+        language=WHISPER_LANGUAGE,
+        prompt=WHISPER_PROMPT
+    )
+
+
+def _transcribe_file(client, audio_path, response_format="json"):
+    with open(audio_path, "rb") as audio_file:
+        return client.audio.transcriptions.create(**_request_params(audio_file, response_format))
+
+
+async def _transcribe_file_async(client, audio_path, response_format="json"):
+    with open(audio_path, "rb") as audio_file:
+        return await client.audio.transcriptions.create(
+            **_request_params(audio_file, response_format)
+        )
+
+
+def find_silences(audio_path):
+    """ Return (start, end) times in seconds of the silent stretches in the audio """
+    result = subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-i", audio_path, "-af",
+         f"silencedetect=noise={SILENCE_NOISE}:d={SILENCE_MIN_SECONDS}", "-f", "null", "-"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors="replace"
+    )
+    starts = [float(t) for t in re.findall(r"silence_start: (-?[\d.]+)", result.stderr)]
+    ends = [float(t) for t in re.findall(r"silence_end: ([\d.]+)", result.stderr)]
+    return list(zip(starts, ends))
+
+
+def plan_chunks(duration, silences, max_seconds=CHUNK_MAX_SECONDS, min_seconds=CHUNK_MIN_SECONDS):
+    """ Split [0, duration] into (start, end) chunks of at most `max_seconds`,
+    cutting in the middle of the last silence after `min_seconds` where possible """
+    chunks = []
+    start = 0.0
+    while duration - start > max_seconds:
+        cuts = [(s + e) / 2 for s, e in silences
+                if start + min_seconds <= (s + e) / 2 <= start + max_seconds]
+        end = cuts[-1] if cuts else start + max_seconds
+        chunks.append((start, end))
+        start = end
+    chunks.append((start, duration))
+    return chunks
+
+
+def _cut_chunk(audio_path, start, end, chunk_path):
+    subprocess.run(
+        [FFMPEG_BINARY, "-y", "-loglevel", "error", "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}",
+         "-i", audio_path, "-vn", "-ac", "1", "-ar", str(SPEECH_SAMPLE_RATE),
+         "-c:a", "libopus", "-b:a", SPEECH_BITRATE, chunk_path],
+        check=True
+    )
+
+
+def _offset_segments(transcription, offset):
+    return [{"start": segment.start + offset, "end": segment.end + offset, "text": segment.text}
+            for segment in transcription.segments or []]
+
+
+def _join_chunks(results):
+    text = " ".join(chunk_text.strip() for chunk_text, _ in results if chunk_text.strip())
+    segments = [segment for _, chunk_segments in results for segment in chunk_segments]
+    return text, segments
+
+
+def _needs_chunking(audio_path):
+    duration = probe_duration(audio_path)
+    return (os.path.getsize(audio_path) > MAX_UPLOAD_BYTES
+            or (duration is not None and duration > CHUNK_MAX_SECONDS))
+
+
+def _plan_audio_chunks(audio_path):
+    duration = probe_duration(audio_path)
+    if duration is None:
+        raise ValueError(f"Could not determine the duration of {audio_path}")
+    chunks = plan_chunks(duration, find_silences(audio_path))
+    print(f"Transcribing {len(chunks)} chunks of {audio_path}")
+    return chunks
+
+
+def _transcribe_chunk(client, audio_path, start, end, chunk_path):
+    _cut_chunk(audio_path, start, end, chunk_path)
+    transcription = _transcribe_file(client, chunk_path, response_format="verbose_json")
+    return transcription.text, _offset_segments(transcription, start)
+
+
+async def _transcribe_chunk_async(client, semaphore, audio_path, start, end, chunk_path):
+    async with semaphore:
+        await asyncio.to_thread(_cut_chunk, audio_path, start, end, chunk_path)
+        transcription = await _transcribe_file_async(client, chunk_path,
+                                                     response_format="verbose_json")
+    return transcription.text, _offset_segments(transcription, start)
+
+
+def transcript_cache_key(audio_path):
+    """ Return the TextCache key of the audio file's transcript: a hash of the
+    audio bytes plus every request parameter that affects the text """
+    return make_text_key(hash_file(audio_path), model=WHISPER_MODEL,
+                         language=WHISPER_LANGUAGE, prompt=WHISPER_PROMPT)
+
+
+def transcribe_chunked(audio_path, max_workers=CHUNK_WORKERS, client=None):
+    """ Transcribe long audio by splitting it at silences and transcribing the
+    chunks concurrently.
+
+    Returns (text, segments) where segments are dicts with "start", "end" and
+    "text", their timestamps relative to the start of the full audio.
+    """
+    client = client or get_client()
+    chunks = _plan_audio_chunks(audio_path)
+
+    with tempfile.TemporaryDirectory(prefix="transcribe_") as chunk_dir:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_transcribe_chunk, client, audio_path, start, end,
+                                os.path.join(chunk_dir, f"chunk_{i}.ogg"))
+                for i, (start, end) in enumerate(chunks)
+            ]
+            # Results are collected in submission order, i.e. timeline order
+            results = [future.result() for future in futures]
+
+    return _join_chunks(results)
+
+
+async def transcribe_chunked_async(audio_path, max_workers=CHUNK_WORKERS, client=None):
+    """ Async variant of transcribe_chunked, at most `max_workers` chunks in flight """
+    client = client or get_async_client()
+    chunks = await asyncio.to_thread(_plan_audio_chunks, audio_path)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    with tempfile.TemporaryDirectory(prefix="transcribe_") as chunk_dir:
+        results = await asyncio.gather(*(
+            _transcribe_chunk_async(client, semaphore, audio_path, start, end,
+                                    os.path.join(chunk_dir, f"chunk_{i}.ogg"))
+            for i, (start, end) in enumerate(chunks)
+        ))
+
+    return _join_chunks(results)
+
+
+def _store_transcript(cache, cache_key, text):
+    """ Cache a transcript; a failed write must not discard the paid result """
+    try:
+        cache.put(cache_key, text)
+    except Exception as e:
+        print("Failed to cache the transcription:", str(e))
+
+
+def transcribe(audio_path, client=None, cache=None):
+    """ Transcribe the audio file using OpenAI Whisper API.
+
+    With a result_cache.TextCache as `cache`, audio with the same bytes is
+    only sent to the API once per model/language/prompt.
+    """
     try:
         # Check if file exists
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        with open(audio_path, "rb") as audio_file:
-            transcription = client.audio.transcriptions.create(
-                model="whisper-1", 
-                file=audio_file,
-                response_format="json",  # Ensure the response is in JSON format
-                language="en",  # Set language to English
-                prompt="Please describe this product in detail including: 1. Product name and type 2. Brand or manufacturer 3. Key features and specifications 4. Condition 5. Age or usage period 6. Included accessories 7. Reason for selling 8. Price expectation. Format the description in complete sentences suitable for an online marketplace listing."
-            )
-
-        print("Transcription received:", transcription)  # Debug output
-        
-        # Check response type
-        if hasattr(transcription, "text"):
-            return transcription.text  # Return just the text without timestamp wrapper
+        cache_key = None
+        if cache is not None:
+            cache_key = transcript_cache_key(audio_path)
+            text = cache.get(cache_key)
+            if text is not None:
+                print("Transcription served from cache")
+                return text
+
+        client = client or get_client()
+        if _needs_chunking(audio_path):
+            text, _ = transcribe_chunked(audio_path, client=client)
+        else:
+            transcription = _transcribe_file(client, audio_path)
+            print("Transcription received:", transcription)  # Debug output
+
+            # Check response type
+            if not hasattr(transcription, "text"):
+                return []
+            text = transcription.text  # Return just the text without timestamp wrapper
 
+        if cache_key is not None:
+            _store_transcript(cache, cache_key, text)
+        return text
+
+    except Exception as e:
+        print("Error during transcription:", str(e))
         return []
-    
+
+
+async def transcribe_async(audio_path, client=None, cache=None):
+    """ Async variant of transcribe using the async OpenAI client """
+    try:
+        # Check if file exists
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        cache_key = None
+        if cache is not None:
+            cache_key = await asyncio.to_thread(transcript_cache_key, audio_path)
+            text = cache.get(cache_key)
+            if text is not None:
+                print("Transcription served from cache")
+                return text
+
+        client = client or get_async_client()
+        if await asyncio.to_thread(_needs_chunking, audio_path):
+            text, _ = await transcribe_chunked_async(audio_path, client=client)
+        else:
+            transcription = await _transcribe_file_async(client, audio_path)
+            print("Transcription received:", transcription)  # Debug output
+
+            if not hasattr(transcription, "text"):
+                return []
+            text = transcription.text
+
+        if cache_key is not None:
+            _store_transcript(cache, cache_key, text)
+        return text
+
     except Exception as e:
         print("Error during transcription:", str(e))
         return []
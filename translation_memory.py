@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from text_segments import split_segments
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_MEMORY_PATH = "outputs/cache/translations.sqlite3"
+TRANSLATION_MEMORY_MAX_ENTRIES = 200000
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_BATCH = 500
+
+
+class TranslationMemory:
+    """Persistent sentence-level translation memory in a SQLite file, evicted
+    least-recently-used beyond `max_entries`. Safe to share between threads."""
+
+    def __init__(self, path: str = TRANSLATION_MEMORY_PATH,
+                 max_entries: int = TRANSLATION_MEMORY_MAX_ENTRIES):
+        """Open (or create) the memory stored at `path`."""
+        self.path = path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " source TEXT NOT NULL, target_lang TEXT NOT NULL, model TEXT NOT NULL,"
+                " translation TEXT NOT NULL, used REAL NOT NULL,"
+                " PRIMARY KEY (source, target_lang, model))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS translations_used ON translations (used)")
+
+    def get_many(self, segments: Iterable[str], target_lang: str, model: str) -> Dict[str, str]:
+        """Look up the known translations of several segments.
+
+        Args:
+            segments: Source segments
+            target_lang: Target language code
+            model: Model that produced the translations
+
+        Returns:
+            dict: Source segment -> translation, for the segments found
+        """
+        segments = list(segments)
+        found = {}
+        with self._lock, self._db:
+            for start in range(0, len(segments), _QUERY_BATCH):
+                batch = segments[start:start + _QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._db.execute(
+                    f"SELECT source, translation FROM translations WHERE target_lang = ?"
+                    f" AND model = ? AND source IN ({placeholders})",
+                    [target_lang, model, *batch],
+                ))
+            # Refresh the recency used for LRU eviction
+            now = time.time()
+            self._db.executemany(
+                "UPDATE translations SET used = ? WHERE source = ? AND target_lang = ? AND model = ?",
+                [(now, source, target_lang, model) for source in found],
+            )
+        return found
+
+    def put_many(self, translations: Dict[str, str], target_lang: str, model: str) -> None:
+        """Store translations, evicting the least recently used ones if needed.
+
+        Args:
+            translations: Source segment -> translation
+            target_lang: Target language code
+            model: Model that produced the translations
+        """
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                [(source, target_lang, model, translation, now)
+                 for source, translation in translations.items()],
+            )
+            (count,) = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()
+            if count > self.max_entries:
+                self._db.execute(
+                    "DELETE FROM translations WHERE rowid IN"
+                    " (SELECT rowid FROM translations ORDER BY used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+class TranslationBatch:
+    """The segments of several texts to translate into one language.
+
+    Segments already in the memory are filled in on construction; the rest
+    (`pending`, deduplicated across all texts) are translated together in a
+    single API call and passed to resolve().
+    """
+
+    def __init__(self, texts: List[str], target_lang: str, model: str,
+                 memory: Optional[TranslationMemory] = None):
+        """Split the texts and look their segments up in the memory.
+
+        Args:
+            texts: Texts to translate
+            target_lang: Target language code
+            model: Model used for the translation
+            memory: Optional translation memory consulted and updated
+        """
+        self.target_lang = target_lang
+        self.model = model
+        self.memory = memory
+        self.parts = [split_segments(text) for text in texts]
+
+        # dict keeps the first-seen order while deduplicating
+        segments = list(dict.fromkeys(
+            segment for parts in self.parts for segment in parts[::2] if segment.strip()
+        ))
+        self.translations = memory.get_many(segments, target_lang, model) if memory else {}
+        self.pending = [segment for segment in segments if segment not in self.translations]
+        if self.translations:
+            logger.info(f"Translation memory: {len(self.translations)} of {len(segments)} "
+                        f"segments known for {target_lang}")
+
+    def resolve(self, response_text: str) -> None:
+        """Record the translations of the pending segments.
+
+        Args:
+            response_text: Model reply holding a JSON array with one
+                translation per pending segment, in order
+
+        Raises:
+            ValueError: If the reply is not an array of the expected length
+        """
+        start, end = response_text.find("["), response_text.rfind("]")
+        translated = json.loads(response_text[start:end + 1]) if start != -1 else None
+        if not isinstance(translated, list) or len(translated) != len(self.pending):
+            raise ValueError("Batched translation reply does not match the requested segments")
+
+        new = dict(zip(self.pending, (str(text) for text in translated)))
+        self.translations.update(new)
+        self.pending = []
+        if self.memory is not None:
+            self.memory.put_many(new, self.target_lang, self.model)
+
+    def texts(self) -> List[str]:
+        """Reassemble the translated texts, keeping the original separators."""
+        return ["".join(self.translations.get(part, part) if i % 2 == 0 else part
+                        for i, part in enumerate(parts))
+                for parts in self.parts]